@@ -0,0 +1,103 @@
+"""
+Crawl Throughput Benchmark
+Runs ec_scraper.py end to end against the local EC portal stand-in
+(candidate_scraper/mock_ec_server.py) and reports requests/sec and wall time.
+
+Usage:
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --latency 50 --jitter 20 --error-rate 0.02 --scale 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'candidate_scraper'))
+
+import ec_scraper
+import mock_ec_server
+
+
+def run_crawl(latency=0, jitter=0, error_rate=0.0, rate_limit=0, pad_bytes=0, scale=1,
+              delay=0.0, retry_backoff=0.05, seed=1, verbose=False):
+    """One full crawl against a fresh stand-in, returns a stats dict"""
+    fixtures = mock_ec_server.synthesize_fixtures(scale=scale)
+    portal = mock_ec_server.MockPortal(fixtures, latency, jitter, error_rate, rate_limit, pad_bytes, seed)
+    server, base_url = mock_ec_server.start_server(portal)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        argv = ['--base-url', base_url, '--delay', str(delay), '--retry-backoff', str(retry_backoff),
+                '--db', str(Path(tmp) / 'bench.db'), '--no-csv']
+        output = io.StringIO()
+        error = None
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(sys.stdout if verbose else output):
+                ec_scraper.main(argv)
+        except (SystemExit, RuntimeError) as e:
+            # The scraper gave up (check_connection exits, fetch raises): report its last words
+            failures = [line.strip(' ✗') for line in output.getvalue().splitlines() if '✗' in line]
+            error = failures[-1] if failures and isinstance(e, SystemExit) else str(e) or repr(e)
+        wall = time.perf_counter() - start
+
+    server.shutdown()
+    server.server_close()
+    stats = dict(portal.stats)
+    return {
+        'constituencies': len(fixtures['candidates']),
+        'requests': stats['requests'],
+        'errors': stats['errors'],
+        'throttled': stats['throttled'],
+        'bytes': stats['bytes'],
+        'wall_seconds': round(wall, 3),
+        'requests_per_second': round(stats['requests'] / wall, 1) if wall else 0.0,
+        'error': error,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ec_scraper.py against the local EC stand-in")
+    parser.add_argument('--latency', type=float, default=0, help="Mean response latency (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="Latency jitter, +/- ms")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=0)
+    parser.add_argument('--pad-bytes', type=int, default=0)
+    parser.add_argument('--scale', type=int, default=1, help="Repeat the election N times")
+    parser.add_argument('--delay', type=float, default=0.0, help="Scraper delay between requests")
+    parser.add_argument('--retry-backoff', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=1, help="Runs to average over")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Show the scraper's own output")
+    args = parser.parse_args(argv)
+
+    runs = [run_crawl(args.latency, args.jitter, args.error_rate, args.rate_limit, args.pad_bytes,
+                      args.scale, args.delay, args.retry_backoff, seed=i + 1, verbose=args.verbose)
+            for i in range(args.repeat)]
+
+    failed = [r for r in runs if r['error']]
+    if args.json:
+        print(json.dumps(runs, indent=2))
+    else:
+        for i, r in enumerate(runs, start=1):
+            print(f"run {i}: {r['constituencies']} constituencies, {r['requests']} requests "
+                  f"({r['errors']} errors, {r['throttled']} throttled), {r['bytes']:,} bytes")
+            print(f"       {r['wall_seconds']:.2f}s wall, {r['requests_per_second']:.1f} requests/sec")
+            if r['error']:
+                print(f"       ✗ crawl failed: {r['error']}")
+        completed = [r for r in runs if not r['error']]
+        if len(completed) > 1:
+            wall = sum(r['wall_seconds'] for r in completed) / len(completed)
+            rps = sum(r['requests_per_second'] for r in completed) / len(completed)
+            print(f"mean:  {wall:.2f}s wall, {rps:.1f} requests/sec ({len(completed)} completed runs)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Scrape-to-Map Pipeline Benchmarks
+Times the hot paths from parsing portal HTML to writing the map page, at the
+current data size and on synthetic 10x / 100x copies, and compares the
+results against benchmarks/baseline.json.
+
+Fixtures:
+- fixtures/portal_candidates.html: 20 candidate tables in the portal's layout.
+  Synthesized from candidates.csv with mock_ec_server.candidates_html, not
+  saved portal responses, so markup quirks of the live portal are not covered
+- python_map/candidates.csv and python_map/Bangladesh_map.geojson as they are
+  in the tree. The Nx sets repeat every district N times: copy k of a district
+  is renamed '<name>.<k>' in both the candidate rows and the GeoJSON, and its
+  polygons are shifted onto a grid so the copies do not overlap
+- map_build stops at MAX_SCALE['map_build']: folium inlines the whole GeoJSON
+  into one page (about 170 MB of geometry at 100x), which is the case
+  stream_build exists for
+
+Per stage and scale it records the median wall time over --repeat runs (at
+least MIN_REPEAT, fewer than --repeat once a stage has used REPEAT_BUDGET
+seconds), the tracemalloc peak of one extra run, and the bytes of what the
+stage produced. Timings are normalized by a fixed calibration loop, so a
+baseline recorded on one machine stays usable on another. The loop is run
+before every stage and the median over the whole run is used, so a burst of
+load while calibrating does not skew every expected time.
+
+A time regression needs to be both TIME_THRESHOLD relatively and TIME_FLOOR
+seconds slower than expected, and stay that slow when the stage is timed
+again up to RECHECK more times: on a shared machine a few seconds of load
+can slow every repeat of one stage. Stages whose expected time is below
+MIN_TIMED_SECONDS are only checked for memory and output size, their timings
+are mostly timer and scheduler noise. On a shared VM, unchanged-tree timings
+of single stages spread by about +-30% between runs (peak memory and output
+size do not move), hence the wide TIME_THRESHOLD; to chase a smaller
+slowdown, time the one stage with --stages and a higher --repeat.
+
+The default run (1/10/100x, all stages) takes about 20 minutes; most of it
+is geometry_meta, groupby and stream_build at 100x (roughly 50, 30 and 25 s
+per run, each run at least MIN_REPEAT times plus once under tracemalloc).
+Use --scales 1,10 for a run of about three minutes.
+
+Usage:
+    python benchmarks/bench_pipeline.py                  # compare with baseline.json
+    python benchmarks/bench_pipeline.py --save-baseline  # record a new baseline
+    python benchmarks/bench_pipeline.py --stages parse_candidates_html,groupby --scales 1,10
+"""
+
+import argparse
+import csv
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'candidate_scraper'))
+sys.path.insert(0, str(ROOT / 'python_map'))
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+import ec_scraper
+import geometry_meta
+import stream_map
+from bengali import get_symbol_image, normalize_bengali
+from readolo import load_module
+
+# --- CONFIGURATION ---
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+CANDIDATES_FILE = ROOT / "python_map" / "candidates.csv"
+GEOJSON_FILE = ROOT / "python_map" / "Bangladesh_map.geojson"
+SYMBOL_IMAGES_FILE = ROOT / "candidate_scraper" / "symbol_images.json"
+SCALES = (1, 10, 100)
+MAX_SCALE = {'map_build': 10}  # Stages that skip larger scales
+GRID_STEP = (5.0, 6.5)  # Degrees (lon, lat) between district copies in the scaled GeoJSON
+REPEAT = 5
+MIN_REPEAT = 3
+REPEAT_BUDGET = 30  # Seconds per stage after which no more than MIN_REPEAT runs are made
+TIME_THRESHOLD = 0.5  # Slower than baseline by more than this fraction = regression
+TIME_FLOOR = 0.1  # ...and by more than this many seconds (sub-second stages vary this much between processes)
+MIN_TIMED_SECONDS = 0.005  # Expected times below this are not checked
+RECHECK = 2  # Extra timings of a stage before a time regression is reported
+MEMORY_THRESHOLD = 0.20
+OUTPUT_THRESHOLD = 0.05
+MAX_CANDIDATES = 15
+# ---------------------
+
+
+def calibrate():
+    """Seconds for a fixed pure-Python workload, used to normalize timings across machines"""
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        total = 0
+        for i in range(300_000):
+            total += len(str(i * 7))
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# --- FIXTURES ---
+
+def scaled_name(name, k):
+    return name if k == 0 else f"{name}.{k}"
+
+
+def load_rows(scale):
+    """candidates.csv rows, every district repeated `scale` times under new names"""
+    with open(CANDIDATES_FILE, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    if scale == 1:
+        return rows
+    return [dict(row, constituency=scaled_name(row['constituency'], k),
+                 parent_district=scaled_name(row['parent_district'], k))
+            for k in range(scale) for row in rows]
+
+
+def shift_coords(coords, dx, dy):
+    if coords and isinstance(coords[0], (int, float)):
+        return [coords[0] + dx, coords[1] + dy, *coords[2:]]
+    return [shift_coords(c, dx, dy) for c in coords]
+
+
+def geojson_path(scale, tmp):
+    """Bangladesh_map.geojson with every district repeated `scale` times (written once per run)"""
+    if scale == 1:
+        return GEOJSON_FILE
+    path = Path(tmp) / f"districts_{scale}.geojson"
+    if path.exists():
+        return path
+    with open(GEOJSON_FILE, 'r') as f:
+        features = json.load(f)['features']
+    with open(path, 'w') as out:
+        out.write('{"type":"FeatureCollection","features":[')
+        for k in range(scale):
+            dx, dy = (k % 10) * GRID_STEP[0], (k // 10) * GRID_STEP[1]
+            for n, feature in enumerate(features):
+                geometry = feature['geometry']
+                copy = {
+                    'type': 'Feature',
+                    'properties': dict(feature['properties'],
+                                       shapeName=scaled_name(feature['properties']['shapeName'], k)),
+                    'geometry': dict(geometry, coordinates=shift_coords(geometry['coordinates'], dx, dy)),
+                }
+                out.write((',' if k or n else '') + json.dumps(copy, separators=(',', ':')))
+        out.write(']}')
+    return path
+
+
+def write_rows(rows, path):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def column_values(rows, prefix):
+    return [row[f'{prefix}_{i}'] for row in rows for i in range(1, MAX_CANDIDATES + 1)
+            if row.get(f'{prefix}_{i}')]
+
+
+def json_bytes(value):
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+# --- STAGES ---
+# Each stage is setup(scale, tmp) -> run, where run() does the timed work and
+# returns the number of bytes it produced.
+
+def stage_parse_candidates_html(scale, tmp):
+    page = (FIXTURES_DIR / 'portal_candidates.html').read_text(encoding='utf-8')
+    pages = [page] * scale
+    return lambda: json_bytes([ec_scraper.parse_candidates_html(p) for p in pages])
+
+
+def stage_normalize_bengali(scale, tmp):
+    names = column_values(load_rows(scale), 'Candidate')
+    return lambda: json_bytes([normalize_bengali(n) for n in names])
+
+
+def stage_get_symbol_image(scale, tmp):
+    symbols = column_values(load_rows(scale), 'Symbol')
+    with open(SYMBOL_IMAGES_FILE, 'r', encoding='utf-8') as f:
+        symbol_images = json.load(f)
+    return lambda: json_bytes([get_symbol_image(s, symbol_images) for s in symbols])
+
+
+def stage_parse_constituency_name(scale, tmp):
+    names = [row['Electoral Name Clean'] for row in load_rows(scale)]
+    return lambda: json_bytes([ec_scraper.parse_constituency_name(n) for n in names])
+
+
+def stage_groupby(scale, tmp):
+    df = pd.DataFrame(load_rows(scale))
+    return lambda: json_bytes({d: g.to_dict('records') for d, g in df.groupby('parent_district')})
+
+
+def stage_geometry_meta(scale, tmp):
+    with open(geojson_path(scale, tmp), 'r') as f:
+        geojson_data = json.load(f)
+    return lambda: json_bytes(geometry_meta.compute(geojson_data))
+
+
+def stage_map_build(scale, tmp):
+    election_map = load_module('election_map')
+    csv_path = Path(tmp) / f"candidates_{scale}.csv"
+    write_rows(load_rows(scale), csv_path)
+    geojson_data = election_map.load_geojson(geojson_path(scale, tmp))
+    template = election_map.load_template()
+    output = Path(tmp) / f"map_{scale}.html"
+
+    def run():
+        df = election_map.load_candidates(csv_path)
+        election_map.build_map(df, geojson_data, template, output)
+        return output.stat().st_size
+    return run
+
+
+def stage_stream_build(scale, tmp):
+    csv_path = Path(tmp) / f"candidates_{scale}.csv"
+    write_rows(load_rows(scale), csv_path)
+    output = Path(tmp) / f"stream_{scale}"
+    return lambda: stream_map.build(csv_path, geojson_path(scale, tmp), output)['output_bytes']
+
+
+STAGES = {
+    'parse_candidates_html': stage_parse_candidates_html,
+    'normalize_bengali': stage_normalize_bengali,
+    'get_symbol_image': stage_get_symbol_image,
+    'parse_constituency_name': stage_parse_constituency_name,
+    'groupby': stage_groupby,
+    'geometry_meta': stage_geometry_meta,
+    'map_build': stage_map_build,
+    'stream_build': stage_stream_build,
+}
+
+
+def measure(setup, scale, repeat, tmp, trace=True):
+    """Median seconds over up to `repeat` runs, tracemalloc peak of one more run, and output bytes"""
+    run = setup(scale, tmp)
+    times = []
+    while len(times) < repeat and (len(times) < MIN_REPEAT or sum(times) < REPEAT_BUDGET):
+        gc.collect()
+        start = time.perf_counter()
+        output_bytes = run()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if trace:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {'seconds': statistics.median(times), 'runs': len(times), 'peak_bytes': peak, 'output_bytes': output_bytes}
+
+
+def too_slow(seconds, expected):
+    return (expected >= MIN_TIMED_SECONDS and seconds > expected * (1 + TIME_THRESHOLD)
+            and seconds > expected + TIME_FLOOR)
+
+
+def recheck(results, baseline, calibration, repeat, tmp):
+    """Time stages that look slower than the baseline again, keeping their fastest median"""
+    speed = calibration / baseline['calibration_seconds']
+    for key, r in results.items():
+        b = baseline['results'].get(key)
+        name, scale = key.rsplit('@', 1)
+        for _ in range(RECHECK):
+            if not b or not too_slow(r['seconds'], b['seconds'] * speed):
+                break
+            seconds = measure(STAGES[name], int(scale[:-1]), repeat, tmp, trace=False)['seconds']
+            print(f"  re-timed {key}: {seconds:.4f}s")
+            r['seconds'] = min(r['seconds'], seconds)
+
+
+def compare(results, baseline, calibration):
+    """Regression messages for results that are worse than the baseline beyond the thresholds"""
+    speed = calibration / baseline['calibration_seconds']
+    problems = []
+    for key, r in results.items():
+        b = baseline['results'].get(key)
+        if not b:
+            continue
+        expected = b['seconds'] * speed
+        if too_slow(r['seconds'], expected):
+            problems.append(f"{key}: {r['seconds']:.4f}s vs {expected:.4f}s expected")
+        if r['peak_bytes'] > b['peak_bytes'] * (1 + MEMORY_THRESHOLD):
+            problems.append(f"{key}: peak {r['peak_bytes']:,} B vs {b['peak_bytes']:,} B")
+        if abs(r['output_bytes'] - b['output_bytes']) > b['output_bytes'] * OUTPUT_THRESHOLD:
+            problems.append(f"{key}: output {r['output_bytes']:,} B vs {b['output_bytes']:,} B")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scrape-to-map pipeline")
+    parser.add_argument('--stages', default=','.join(STAGES), help="Comma-separated stage names")
+    parser.add_argument('--scales', default=','.join(map(str, SCALES)), help="Comma-separated data scales")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="Timed runs per stage (median is used)")
+    parser.add_argument('--baseline', default=str(BASELINE_FILE))
+    parser.add_argument('--save-baseline', action='store_true', help="Write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    stages = args.stages.split(',')
+    scales = [int(s) for s in args.scales.split(',')]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    samples = calibrate()
+    print(f"{'stage':<28}{'scale':>6}{'seconds':>11}{'peak MB':>10}{'output KB':>12}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in stages:
+            for scale in [s for s in scales if s <= MAX_SCALE.get(name, s)]:
+                samples += calibrate()
+                r = measure(STAGES[name], scale, args.repeat, tmp)
+                results[f"{name}@{scale}x"] = r
+                print(f"{name:<28}{scale:>5}x{r['seconds']:>11.4f}{r['peak_bytes'] / 1e6:>10.2f}"
+                      f"{r['output_bytes'] / 1e3:>12.1f}")
+        calibration = statistics.median(samples)
+        print(f"calibration: {calibration * 1000:.1f} ms (median of {len(samples)})")
+
+        if args.save_baseline:
+            with open(args.baseline, 'w') as f:
+                json.dump({'calibration_seconds': calibration, 'results': results}, f, indent=2, sort_keys=True)
+            print(f"\nBaseline saved to {args.baseline}")
+            return
+
+        if not Path(args.baseline).exists():
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+            return
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        recheck(results, baseline, calibration, args.repeat, tmp)
+
+    problems = compare(results, baseline, calibration)
+    if problems:
+        print(f"\n✗ {len(problems)} regressions against {args.baseline}:")
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
+    print(f"\n✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
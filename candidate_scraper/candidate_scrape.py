@@ -1,11 +1,13 @@
+import argparse
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
 import time
+from pathlib import Path
 
 # --- CONFIGURATION ---
-INPUT_FILE = 'links.csv'
-OUTPUT_FILE = 'detailed_election_results.csv'
+INPUT_FILE = Path(__file__).parent / 'links.csv'
+OUTPUT_FILE = Path(__file__).parent / 'detailed_election_results.csv'
 URL_COLUMN = 'url'  # <--- Changed this to match your CSV output
 # ---------------------
 
@@ -58,40 +60,50 @@ def scrape_election_table(url):
 
 # --- Main Logic ---
 
-# 1. Load your CSV
-df = pd.read_csv(INPUT_FILE)
-
-# Clean column names just in case of hidden spaces
-df.columns = df.columns.str.strip()
-
-all_results = []
-
-print(f"Starting scrape for {len(df)} rows...")
-
-for index, row in df.iterrows():
-    # Make sure we use the correct column name here
-    url = row[URL_COLUMN]
-    
-    print(f"[{index+1}/{len(df)}] Scraping: {url}")
-    
-    scraped_info = scrape_election_table(url)
-    
-    # Keep original data + append new scraped columns
-    combined_row = row.tolist() + scraped_info
-    all_results.append(combined_row)
-    
-    # Gentle delay to be kind to Wikipedia's servers
-    time.sleep(1)
-
-# 2. Build final DataFrame
-final_df = pd.DataFrame(all_results)
-
-# 3. Re-apply original headers + generic headers for new data
-original_headers = df.columns.tolist()
-extra_cols_count = len(final_df.columns) - len(original_headers)
-new_headers = original_headers + [f"Extra_{i}" for i in range(extra_cols_count)]
-final_df.columns = new_headers
-
-# 4. Save
-final_df.to_csv(OUTPUT_FILE, index=False)
-print(f"\nSuccess! Saved results to {OUTPUT_FILE}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Wikipedia constituency result tables")
+    parser.add_argument('--input', default=str(INPUT_FILE))
+    parser.add_argument('--output', default=str(OUTPUT_FILE))
+    args = parser.parse_args(argv)
+
+    # 1. Load your CSV
+    df = pd.read_csv(args.input)
+
+    # Clean column names just in case of hidden spaces
+    df.columns = df.columns.str.strip()
+
+    all_results = []
+
+    print(f"Starting scrape for {len(df)} rows...")
+
+    for index, row in df.iterrows():
+        # Make sure we use the correct column name here
+        url = row[URL_COLUMN]
+
+        print(f"[{index+1}/{len(df)}] Scraping: {url}")
+
+        scraped_info = scrape_election_table(url)
+
+        # Keep original data + append new scraped columns
+        combined_row = row.tolist() + scraped_info
+        all_results.append(combined_row)
+
+        # Gentle delay to be kind to Wikipedia's servers
+        time.sleep(1)
+
+    # 2. Build final DataFrame
+    final_df = pd.DataFrame(all_results)
+
+    # 3. Re-apply original headers + generic headers for new data
+    original_headers = df.columns.tolist()
+    extra_cols_count = len(final_df.columns) - len(original_headers)
+    new_headers = original_headers + [f"Extra_{i}" for i in range(extra_cols_count)]
+    final_df.columns = new_headers
+
+    # 4. Save
+    final_df.to_csv(args.output, index=False)
+    print(f"\nSuccess! Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
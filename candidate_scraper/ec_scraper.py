@@ -6,8 +6,14 @@ from http://103.183.38.66
 Requirements:
 - VPN connection to Bangladesh (portal only accessible from BD IPs)
 - pip install requests pandas beautifulsoup4
+
+Every run is also upserted into the election store (election_store.py), so
+earlier elections and by-elections are kept alongside the current one:
+    python ec_scraper.py                      # 478 -> candidates.csv + elections.db
+    python ec_scraper.py --election-id 123 --no-csv
 """
 
+import argparse
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
@@ -17,15 +23,21 @@ import re
 import sys
 from pathlib import Path
 
+import election_store
+from bengali import bengali_to_english_number, get_symbol_image
+
 # --- CONFIGURATION ---
 BASE_URL = "http://103.183.38.66"
 ELECTION_ID = 478  # 13th National Parliament Election (Feb 12, 2026)
 CANDIDATE_TYPE = 1  # Member of Parliament
 STATUS_ID = 11  # 11=Finalized candidates (চূড়ান্ত)
-OUTPUT_FILE = "../python_map/candidates.csv"
-MAPPING_FILE = "district_division_mapping.json"
-SYMBOL_IMAGES_FILE = "symbol_images.json"  # Symbol name → image URL mapping
+OUTPUT_FILE = Path(__file__).parent / "../python_map/candidates.csv"
+MAPPING_FILE = Path(__file__).parent / "district_division_mapping.json"
+SYMBOL_IMAGES_FILE = Path(__file__).parent / "symbol_images.json"  # Symbol name → image URL mapping
 DELAY_SECONDS = 0.5  # Delay between API calls
+MAX_RETRIES = 3  # Retries for throttled (429), 5xx and dropped requests
+RETRY_BACKOFF = 2.0  # Seconds before the first retry, doubled each time
+REQUEST_HOOK = None  # Called before every HTTP request (recrawl_daemon.py charges its budget here)
 MAX_CANDIDATES = 15  # Max candidates per constituency (actual max is 14)
 
 # District name fixes to match GeoJSON spellings
@@ -40,15 +52,13 @@ DISTRICT_NAME_FIXES = {
 def check_connection():
     """Check if EC portal is accessible (requires BD VPN)"""
     try:
-        response = requests.get(BASE_URL, timeout=10)
-        if response.status_code == 200:
-            print("✓ Connected to EC portal")
-            return True
-    except Exception as e:
+        fetch(BASE_URL, {})
+    except RuntimeError as e:
         print(f"✗ Cannot connect to EC portal: {e}")
         print("  Make sure you have VPN connected to Bangladesh")
         return False
-    return False
+    print("✓ Connected to EC portal")
+    return True
 
 
 def load_division_mapping():
@@ -77,84 +87,70 @@ def load_symbol_images():
         return {}
 
 
-def normalize_bengali(text):
+def fetch(url, params):
     """
-    Normalize Bengali text for consistent matching.
-    Bengali has composed vs decomposed forms that look identical but have different Unicode:
-    - 09dc (DDA) vs 09a1+09bc (DA + NUKTA)
-    - 09dd (DDHA) vs 09a2+09bc (DHA + NUKTA)
-    - 09df (YYA) vs 09af+09bc (YA + NUKTA)
+    GET with retries and exponential backoff on throttling, server errors and
+    dropped connections. Raises RuntimeError unless the portal answers 200, so an
+    error page is never parsed as an empty candidate list.
     """
-    import unicodedata
-    if not text:
-        return ''
-    # First apply NFC normalization
-    text = unicodedata.normalize('NFC', text)
-    # Convert composed Bengali chars to decomposed for consistent matching
-    replacements = {
-        '\u09dc': '\u09a1\u09bc',  # DDA -> DA + NUKTA
-        '\u09dd': '\u09a2\u09bc',  # DDHA -> DHA + NUKTA
-        '\u09df': '\u09af\u09bc',  # YYA -> YA + NUKTA
-    }
-    for composed, decomposed in replacements.items():
-        text = text.replace(composed, decomposed)
-    # Normalize whitespace
-    return ' '.join(text.split())
-
-
-def get_symbol_image(symbol_name, symbol_images):
-    """Get image URL for a symbol name, returns empty string if not found"""
-    if not symbol_name:
-        return ''
-    # Try direct match first
-    if symbol_name in symbol_images:
-        return symbol_images[symbol_name]
-    # Try normalized match (handles Bengali Unicode variations)
-    norm_name = normalize_bengali(symbol_name)
-    for key, url in symbol_images.items():
-        if normalize_bengali(key) == norm_name:
-            return url
-    return ''
-
-
-def get_districts():
-    """Fetch all districts for the 2026 election"""
+    for attempt in range(MAX_RETRIES + 1):
+        if REQUEST_HOOK:
+            REQUEST_HOOK()
+        try:
+            response = requests.get(url, params=params, timeout=30)
+            if response.status_code == 200:
+                return response
+            error = f"HTTP {response.status_code}"
+            if response.status_code != 429 and response.status_code < 500:
+                # Other 4xx: retrying will not help
+                raise RuntimeError(f"{url} answered {error}")
+        except requests.RequestException as e:
+            error = str(e)
+        if attempt < MAX_RETRIES:
+            wait = RETRY_BACKOFF * 2 ** attempt
+            print(f"    ! {error}, retrying in {wait:.1f}s")
+            time.sleep(wait)
+    raise RuntimeError(f"Giving up on {url} after {attempt} retries: {error}")
+
+
+def get_districts(election_id=ELECTION_ID):
+    """Fetch all districts for an election"""
     url = f"{BASE_URL}/election-settings/get-election-zilla"
-    params = {'electionID': ELECTION_ID}
+    params = {'electionID': election_id}
 
-    response = requests.get(url, params=params, timeout=30)
+    response = fetch(url, params)
     data = response.json()
 
     return data.get('zillas', [])
 
 
-def get_constituencies(zilla_id):
+def get_constituencies(zilla_id, election_id=ELECTION_ID):
     """Fetch constituencies for a given district"""
     url = f"{BASE_URL}/election/get-setting-constituency"
     params = {
         'zillaID': zilla_id,
-        'electionID': ELECTION_ID
+        'electionID': election_id
     }
 
-    response = requests.get(url, params=params, timeout=30)
+    response = fetch(url, params)
     data = response.json()
 
     return data.get('constituencies', [])
 
 
-def get_candidates(zilla_id, constituency_id):
+def get_candidates(zilla_id, constituency_id, election_id=ELECTION_ID, status_id=STATUS_ID):
     """Fetch candidates for a given constituency (returns HTML)"""
     url = f"{BASE_URL}/get/candidate/data"
     params = {
-        'election_id': ELECTION_ID,
+        'election_id': election_id,
         'zilla_id': zilla_id,
         'constituency_id': constituency_id,
         'candidate_type': CANDIDATE_TYPE,
     }
-    if STATUS_ID:
-        params['status_id'] = STATUS_ID
+    if status_id:
+        params['status_id'] = status_id
 
-    response = requests.get(url, params=params, timeout=30)
+    response = fetch(url, params)
     return response.text
 
 
@@ -187,17 +183,6 @@ def parse_candidates_html(html):
     return candidates
 
 
-def bengali_to_english_number(bn_str):
-    """Convert Bengali numerals to English"""
-    bn_digits = '০১২৩৪৫৬৭৮৯'
-    en_digits = '0123456789'
-
-    result = bn_str
-    for bn, en in zip(bn_digits, en_digits):
-        result = result.replace(bn, en)
-    return result
-
-
 def parse_constituency_name(bn_name):
     """
     Parse Bengali constituency name like 'ঢাকা-১' to 'Dhaka-1'
@@ -212,10 +197,38 @@ def parse_constituency_name(bn_name):
     return bn_name, ''
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape EC portal candidates into the election store")
+    parser.add_argument('--election-id', type=int, default=ELECTION_ID,
+                        help=f"EC electionID to scrape (default {ELECTION_ID})")
+    parser.add_argument('--election-name', default='',
+                        help="Human readable election name stored alongside the ID")
+    parser.add_argument('--status-id', type=int, default=STATUS_ID,
+                        help=f"Candidate status filter (default {STATUS_ID}, 0 = all)")
+    parser.add_argument('--db', default=str(election_store.DB_FILE),
+                        help="Election store (SQLite) to upsert into")
+    parser.add_argument('--no-csv', action='store_true',
+                        help=f"Only write the store, not {OUTPUT_FILE}")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help="Portal to crawl, e.g. a local mock_ec_server.py")
+    parser.add_argument('--delay', type=float, default=DELAY_SECONDS,
+                        help=f"Seconds between candidate requests (default {DELAY_SECONDS})")
+    parser.add_argument('--retry-backoff', type=float, default=RETRY_BACKOFF,
+                        help=f"Seconds before the first retry (default {RETRY_BACKOFF})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global BASE_URL, DELAY_SECONDS, RETRY_BACKOFF
+    args = parse_args(argv)
+    election_id = args.election_id
+    BASE_URL = args.base_url.rstrip('/')
+    DELAY_SECONDS = args.delay
+    RETRY_BACKOFF = args.retry_backoff
+
     print("=" * 60)
     print("Bangladesh EC Portal Candidate Scraper")
-    print("13th National Parliament Election (Feb 12, 2026)")
+    print(f"Election ID {election_id} {args.election_name}")
     print("=" * 60)
 
     # Check connection
@@ -232,15 +245,22 @@ def main():
     symbol_images = load_symbol_images()
     print(f"✓ Loaded {len(symbol_images)} symbol image mappings")
 
+    # Open the election store
+    conn = election_store.connect(args.db)
+    election_store.upsert_election(conn, election_id, args.election_name, args.status_id or None)
+    print(f"✓ Writing to election store {args.db}")
+
     # Fetch all districts
     print("\nFetching districts...")
-    districts = get_districts()
+    districts = get_districts(election_id)
     print(f"✓ Found {len(districts)} districts")
 
     # Collect all data
     all_rows = []
     total_constituencies = 0
     total_candidates = 0
+    changed_constituencies = 0
+    failed_constituencies = 0
 
     for i, district in enumerate(districts):
         zilla_id = district['zillaID']
@@ -257,7 +277,7 @@ def main():
         print(f"\n[{i+1}/{len(districts)}] {district_en} ({division})")
 
         # Fetch constituencies for this district
-        constituencies = get_constituencies(zilla_id)
+        constituencies = get_constituencies(zilla_id, election_id)
         print(f"  Found {len(constituencies)} constituencies")
 
         for const in constituencies:
@@ -268,15 +288,32 @@ def main():
             _, const_num = parse_constituency_name(const_name_bn)
             constituency_code = f"{district_en}-{const_num}" if const_num else const_name_bn
 
+            store_id = election_store.upsert_constituency(
+                conn, election_id, const_id, zilla_id=zilla_id, district_bn=zilla_name_bn,
+                district_en=district_en, division=division, name_bn=const_name_bn,
+                code=constituency_code)
+            total_constituencies += 1
+
             # Fetch candidates
             time.sleep(DELAY_SECONDS)
-            html = get_candidates(zilla_id, const_id)
+            try:
+                html = get_candidates(zilla_id, const_id, election_id, args.status_id)
+            except RuntimeError as e:
+                # Keep what the store already has rather than blanking the seat
+                print(f"    ✗ {constituency_code}: {e} (keeping stored candidates)")
+                failed_constituencies += 1
+                all_rows.extend(election_store.election_rows(conn, election_id, store_id))
+                continue
             candidates = parse_candidates_html(html)
 
             print(f"    {constituency_code}: {len(candidates)} candidates")
-            total_constituencies += 1
             total_candidates += len(candidates)
 
+            # Upsert into the store
+            if election_store.replace_candidacies(conn, election_id, store_id, district_en,
+                                                  candidates, symbol_images):
+                changed_constituencies += 1
+
             # Build row for CSV
             row = {
                 'Districts': zilla_name_bn,
@@ -309,26 +346,30 @@ def main():
 
             all_rows.append(row)
 
-    # Create DataFrame with proper column order
-    columns = [
-        'Districts', 'District Name Clean', 'Electoral Name Clean',
-        'constituency', 'url', 'parent_district', 'divisions',
-    ]
-    # Add candidate columns dynamically (including Symbol)
-    for i in range(1, MAX_CANDIDATES + 1):
-        columns.extend([f'Candidate_{i}', f'Party_{i}', f'Symbol_{i}', f'Img_{i}'])
-
-    df = pd.DataFrame(all_rows, columns=columns)
+        # Commit per district so an interrupted run keeps what it fetched
+        conn.commit()
 
-    # Save to CSV
-    output_path = Path(__file__).parent / OUTPUT_FILE
-    df.to_csv(output_path, index=False, encoding='utf-8')
+    conn.close()
 
     print("\n" + "=" * 60)
     print("SCRAPING COMPLETE")
     print("=" * 60)
     print(f"Total constituencies: {total_constituencies}")
     print(f"Total candidates: {total_candidates}")
+    print(f"Changed constituencies: {changed_constituencies}")
+    print(f"Failed constituencies: {failed_constituencies}")
+    print(f"Election store: {args.db}")
+
+    if args.no_csv:
+        return
+
+    # Create DataFrame with proper column order (including Symbol)
+    columns = election_store.csv_columns(MAX_CANDIDATES)
+    df = pd.DataFrame(all_rows, columns=columns)
+
+    # Save to CSV
+    output_path = OUTPUT_FILE.resolve()
+    df.to_csv(output_path, index=False, encoding='utf-8')
     print(f"Output saved to: {output_path}")
 
 
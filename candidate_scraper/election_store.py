@@ -0,0 +1,357 @@
+"""
+Election Store
+Persistent SQLite store for EC candidate data across many elections
+(parliamentary elections, by-elections, ...).
+
+Tables:
+- elections       one row per EC electionID
+- constituencies  per election, keyed by the EC constituencyID
+- parties         party names (shared across elections)
+- symbols         election symbol names and their image URL
+- candidates      people, keyed by normalized name + district
+- candidacies     who stood where, for which party, with which symbol
+- crawl_state     when each constituency was last fetched / last changed
+
+ec_scraper.py upserts into this store; the map builder can read any
+election back out in the candidates.csv column layout.
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bengali import get_symbol_image, normalize_bengali
+
+DB_FILE = Path(__file__).parent / "elections.db"
+MAX_CANDIDATES = 15  # Candidate columns in the candidates.csv layout
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS elections (
+    election_id     INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL DEFAULT '',
+    status_id       INTEGER,
+    updated_at      TEXT
+);
+
+CREATE TABLE IF NOT EXISTS constituencies (
+    constituency_id     INTEGER PRIMARY KEY,
+    election_id         INTEGER NOT NULL REFERENCES elections(election_id),
+    ec_constituency_id  INTEGER NOT NULL,
+    zilla_id            INTEGER,
+    district_bn         TEXT NOT NULL DEFAULT '',
+    district_en         TEXT NOT NULL DEFAULT '',
+    division            TEXT NOT NULL DEFAULT '',
+    name_bn             TEXT NOT NULL DEFAULT '',
+    code                TEXT NOT NULL DEFAULT '',
+    UNIQUE (election_id, ec_constituency_id)
+);
+CREATE INDEX IF NOT EXISTS idx_constituencies_code ON constituencies(code, election_id);
+
+CREATE TABLE IF NOT EXISTS parties (
+    party_id    INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol_id   INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    image_url   TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    candidate_id    INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    name_norm       TEXT NOT NULL,
+    district_en     TEXT NOT NULL DEFAULT '',
+    UNIQUE (name_norm, district_en)
+);
+
+CREATE TABLE IF NOT EXISTS candidacies (
+    constituency_id INTEGER NOT NULL REFERENCES constituencies(constituency_id) ON DELETE CASCADE,
+    position        INTEGER NOT NULL,
+    election_id     INTEGER NOT NULL REFERENCES elections(election_id),
+    candidate_id    INTEGER NOT NULL REFERENCES candidates(candidate_id),
+    party_id        INTEGER REFERENCES parties(party_id),
+    symbol_id       INTEGER REFERENCES symbols(symbol_id),
+    photo_url       TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (constituency_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_candidacies_candidate ON candidacies(candidate_id, election_id);
+CREATE INDEX IF NOT EXISTS idx_candidacies_party ON candidacies(party_id, election_id);
+CREATE INDEX IF NOT EXISTS idx_candidacies_election ON candidacies(election_id);
+
+CREATE TABLE IF NOT EXISTS crawl_state (
+    constituency_id INTEGER PRIMARY KEY REFERENCES constituencies(constituency_id) ON DELETE CASCADE,
+    last_checked    REAL,
+    last_changed    REAL,
+    checks          INTEGER NOT NULL DEFAULT 0,
+    changes         INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def connect(path=DB_FILE):
+    """Open (and create if needed) the election store"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _lookup_id(conn, table, id_column, name, **extra):
+    """Get-or-create a row in a name-keyed lookup table (parties, symbols)"""
+    if not name:
+        return None
+    row = conn.execute(f"SELECT {id_column} FROM {table} WHERE name = ?", (name,)).fetchone()
+    if row:
+        if extra:
+            sets = ', '.join(f"{k} = ?" for k in extra)
+            conn.execute(f"UPDATE {table} SET {sets} WHERE {id_column} = ?",
+                         (*extra.values(), row[0]))
+        return row[0]
+    columns = ', '.join(['name', *extra])
+    marks = ', '.join('?' * (1 + len(extra)))
+    cur = conn.execute(f"INSERT INTO {table} ({columns}) VALUES ({marks})", (name, *extra.values()))
+    return cur.lastrowid
+
+
+def upsert_election(conn, election_id, name='', status_id=None):
+    """Insert or update an election"""
+    conn.execute("""
+        INSERT INTO elections (election_id, name, status_id, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (election_id) DO UPDATE SET
+            name = CASE WHEN excluded.name != '' THEN excluded.name ELSE elections.name END,
+            status_id = COALESCE(excluded.status_id, elections.status_id),
+            updated_at = excluded.updated_at
+    """, (election_id, name, status_id, _now()))
+
+
+def upsert_constituency(conn, election_id, ec_constituency_id, zilla_id=None,
+                        district_bn='', district_en='', division='', name_bn='', code=''):
+    """Insert or update a constituency, returns its store id"""
+    conn.execute("""
+        INSERT INTO constituencies (election_id, ec_constituency_id, zilla_id, district_bn,
+                                    district_en, division, name_bn, code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (election_id, ec_constituency_id) DO UPDATE SET
+            zilla_id = excluded.zilla_id,
+            district_bn = excluded.district_bn,
+            district_en = excluded.district_en,
+            division = excluded.division,
+            name_bn = excluded.name_bn,
+            code = excluded.code
+    """, (election_id, ec_constituency_id, zilla_id, district_bn, district_en, division, name_bn, code))
+    row = conn.execute(
+        "SELECT constituency_id FROM constituencies WHERE election_id = ? AND ec_constituency_id = ?",
+        (election_id, ec_constituency_id)).fetchone()
+    return row[0]
+
+
+def _candidate_id(conn, name, district_en):
+    name_norm = normalize_bengali(name)
+    conn.execute("""
+        INSERT INTO candidates (name, name_norm, district_en) VALUES (?, ?, ?)
+        ON CONFLICT (name_norm, district_en) DO NOTHING
+    """, (name, name_norm, district_en))
+    row = conn.execute("SELECT candidate_id FROM candidates WHERE name_norm = ? AND district_en = ?",
+                       (name_norm, district_en)).fetchone()
+    return row[0]
+
+
+def _candidacy_rows(conn, constituency_id):
+    return [tuple(r) for r in conn.execute("""
+        SELECT ca.name_norm, p.name, s.name, cy.photo_url
+        FROM candidacies cy
+        JOIN candidates ca USING (candidate_id)
+        LEFT JOIN parties p USING (party_id)
+        LEFT JOIN symbols s USING (symbol_id)
+        WHERE cy.constituency_id = ?
+        ORDER BY cy.position
+    """, (constituency_id,))]
+
+
+def replace_candidacies(conn, election_id, constituency_id, district_en, candidates, symbol_images=None):
+    """
+    Replace the candidate list of one constituency.
+    `candidates` are dicts from ec_scraper.parse_candidates_html (name, party, symbol, img).
+    Returns True if the stored list changed.
+    """
+    symbol_images = symbol_images or {}
+    # Same lookup as the scraper's CSV (exact, then normalized symbol name)
+    images = {c.get('symbol', ''): get_symbol_image(c.get('symbol', ''), symbol_images) for c in candidates}
+    before = _candidacy_rows(conn, constituency_id)
+    # Compared on normalized names: a candidate row keeps the first spelling seen
+    after = [(normalize_bengali(c['name']), c['party'] or None, c.get('symbol') or None, c.get('img', ''))
+             for c in candidates]
+    if before == after:
+        # Still pick up symbol images added to symbol_images.json since the last change
+        conn.executemany("UPDATE symbols SET image_url = ? WHERE name = ? AND image_url != ?",
+                         [(url, symbol, url) for symbol, url in images.items() if symbol and url])
+        return False
+
+    conn.execute("DELETE FROM candidacies WHERE constituency_id = ?", (constituency_id,))
+    for position, c in enumerate(candidates, start=1):
+        symbol = c.get('symbol', '')
+        symbol_extra = {'image_url': images[symbol]} if images.get(symbol) else {}
+        conn.execute("""
+            INSERT INTO candidacies (constituency_id, position, election_id, candidate_id,
+                                     party_id, symbol_id, photo_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            constituency_id, position, election_id,
+            _candidate_id(conn, c['name'], district_en),
+            _lookup_id(conn, 'parties', 'party_id', c['party']),
+            _lookup_id(conn, 'symbols', 'symbol_id', symbol, **symbol_extra),
+            c.get('img', ''),
+        ))
+    return True
+
+
+def record_check(conn, constituency_id, checked_at, changed):
+    """Remember when a constituency was last fetched and whether its candidates changed"""
+    conn.execute("""
+        INSERT INTO crawl_state (constituency_id, last_checked, last_changed, checks, changes)
+        VALUES (?, ?, ?, 1, ?)
+        ON CONFLICT (constituency_id) DO UPDATE SET
+            last_checked = excluded.last_checked,
+            last_changed = COALESCE(excluded.last_changed, crawl_state.last_changed),
+            checks = crawl_state.checks + 1,
+            changes = crawl_state.changes + excluded.changes
+    """, (constituency_id, checked_at, checked_at if changed else None, int(changed)))
+
+
+# --- QUERIES ---
+
+def list_elections(conn):
+    """All stored elections with constituency and candidacy counts"""
+    return conn.execute("""
+        SELECT e.election_id, e.name, e.status_id, e.updated_at,
+               (SELECT COUNT(*) FROM constituencies c WHERE c.election_id = e.election_id) AS constituencies,
+               (SELECT COUNT(*) FROM candidacies cy WHERE cy.election_id = e.election_id) AS candidacies
+        FROM elections e
+        ORDER BY e.election_id
+    """).fetchall()
+
+
+def candidate_history(conn, name, district_en=None):
+    """Every candidacy of a person (matched on normalized name) across elections"""
+    sql = """
+        SELECT cy.election_id, e.name AS election, co.code AS constituency, co.name_bn,
+               ca.name, p.name AS party, s.name AS symbol
+        FROM candidates ca
+        JOIN candidacies cy USING (candidate_id)
+        JOIN constituencies co USING (constituency_id)
+        JOIN elections e ON e.election_id = cy.election_id
+        LEFT JOIN parties p USING (party_id)
+        LEFT JOIN symbols s USING (symbol_id)
+        WHERE ca.name_norm = ?
+    """
+    params = [normalize_bengali(name)]
+    if district_en:
+        sql += " AND ca.district_en = ?"
+        params.append(district_en)
+    return conn.execute(sql + " ORDER BY cy.election_id", params).fetchall()
+
+
+def party_coverage(conn, party=None):
+    """Seats contested per party per election (optionally for one party)"""
+    sql = """
+        SELECT cy.election_id, p.name AS party, COUNT(DISTINCT cy.constituency_id) AS seats
+        FROM candidacies cy
+        JOIN parties p USING (party_id)
+    """
+    params = []
+    if party:
+        sql += " WHERE p.name = ?"
+        params.append(party)
+    return conn.execute(sql + " GROUP BY cy.election_id, p.party_id ORDER BY cy.election_id, seats DESC",
+                        params).fetchall()
+
+
+def crawl_states(conn, election_id):
+    """Constituencies of an election with their crawl bookkeeping (NULLs if never crawled)"""
+    return conn.execute("""
+        SELECT co.constituency_id, co.ec_constituency_id, co.zilla_id, co.code, co.district_en,
+               cs.last_checked, cs.last_changed, COALESCE(cs.checks, 0) AS checks,
+               COALESCE(cs.changes, 0) AS changes
+        FROM constituencies co
+        LEFT JOIN crawl_state cs USING (constituency_id)
+        WHERE co.election_id = ?
+    """, (election_id,)).fetchall()
+
+
+def csv_columns(max_candidates=MAX_CANDIDATES):
+    """Column order of candidates.csv"""
+    columns = [
+        'Districts', 'District Name Clean', 'Electoral Name Clean',
+        'constituency', 'url', 'parent_district', 'divisions',
+    ]
+    for i in range(1, max_candidates + 1):
+        columns.extend([f'Candidate_{i}', f'Party_{i}', f'Symbol_{i}', f'Img_{i}'])
+    return columns
+
+
+def election_rows(conn, election_id, constituency_id=None, max_candidates=MAX_CANDIDATES):
+    """
+    One election in the candidates.csv layout (one dict per constituency),
+    or just one constituency of it if `constituency_id` is given.
+    Img_N is the symbol image if known, otherwise the candidate photo.
+    """
+    only, extra = ("", ()) if constituency_id is None else ("AND constituency_id = ?", (constituency_id,))
+    rows = {}
+    for r in conn.execute("""
+        SELECT co.constituency_id, co.district_bn, co.district_en, co.division, co.name_bn, co.code
+        FROM constituencies co
+        WHERE co.election_id = ? {only}
+        ORDER BY co.zilla_id, co.ec_constituency_id
+    """.format(only=only), (election_id, *extra)):
+        row = {
+            'Districts': r['district_bn'],
+            'District Name Clean': r['district_en'],
+            'Electoral Name Clean': r['name_bn'],
+            'constituency': r['code'],
+            'url': '',
+            'parent_district': r['district_en'],
+            'divisions': r['division'],
+        }
+        for i in range(1, max_candidates + 1):
+            row.update({f'Candidate_{i}': '', f'Party_{i}': '', f'Symbol_{i}': '', f'Img_{i}': ''})
+        rows[r['constituency_id']] = row
+
+    for r in conn.execute("""
+        SELECT cy.constituency_id, cy.position, ca.name, p.name AS party, s.name AS symbol,
+               COALESCE(NULLIF(s.image_url, ''), cy.photo_url) AS img
+        FROM candidacies cy
+        JOIN candidates ca USING (candidate_id)
+        LEFT JOIN parties p USING (party_id)
+        LEFT JOIN symbols s USING (symbol_id)
+        WHERE cy.election_id = ? AND cy.position <= ? {only}
+    """.format(only=only), (election_id, max_candidates, *extra)):
+        i = r['position']
+        rows[r['constituency_id']].update({
+            f'Candidate_{i}': r['name'],
+            f'Party_{i}': r['party'] or '',
+            f'Symbol_{i}': r['symbol'] or '',
+            f'Img_{i}': r['img'] or '',
+        })
+    return list(rows.values())
+
+
+def main():
+    """Print a summary of what the store holds"""
+    conn = connect()
+    for e in list_elections(conn):
+        print(f"{e['election_id']:>5}  {e['name'] or '-':<40} "
+              f"{e['constituencies']:>4} constituencies  {e['candidacies']:>5} candidacies  "
+              f"(updated {e['updated_at']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Local EC Portal Stand-in
+Serves the three endpoints ec_scraper.py crawls, so the crawler can be run
+and load-tested without a Bangladesh VPN:
+- /election-settings/get-election-zilla?electionID=
+- /election/get-setting-constituency?zillaID=&electionID=
+- /get/candidate/data?election_id=&zilla_id=&constituency_id=&...
+
+Fixtures are either recorded responses (a directory written by
+`--record DIR`, or by hand) or synthesized from candidates.csv and
+district_division_mapping.json. Latency, error rate, throttling and
+payload size are configurable; /_stats returns request counters as JSON.
+
+Usage:
+    python mock_ec_server.py --port 8478
+    python mock_ec_server.py --latency 80 --jitter 40 --error-rate 0.02 --rate-limit 20
+    python ec_scraper.py --base-url http://127.0.0.1:8478 --delay 0 --no-csv --db /tmp/mock.db
+"""
+
+import argparse
+import csv
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# --- CONFIGURATION ---
+CANDIDATES_FILE = Path(__file__).parent / "../python_map/candidates.csv"
+MAPPING_FILE = Path(__file__).parent / "district_division_mapping.json"
+PORT = 8478
+MAX_CANDIDATES = 15
+
+# Same fixes ec_scraper applies, reversed to find the portal's district for a GeoJSON name
+DISTRICT_NAME_FIXES = {
+    'Brahmanbaria': 'Brahamanbaria',
+    'Moulvibazar': 'Maulvibazar',
+    'Netrokona': 'Netrakona'
+}
+# ---------------------
+
+
+def candidates_html(candidates):
+    """Candidate table in the portal's layout: <th>serial</th><td>name</td><td>photo</td><td>party</td><td>symbol</td>"""
+    rows = []
+    for i, c in enumerate(candidates, start=1):
+        rows.append(
+            f"<tr><th>{i}</th><td>{html.escape(c['name'])}</td>"
+            f"<td><img src=\"{html.escape(c['img'])}\"></td>"
+            f"<td>{html.escape(c['party'])}</td><td>{html.escape(c['symbol'])}</td></tr>"
+        )
+    return "<table><tbody>" + "".join(rows) + "</tbody></table>"
+
+
+def synthesize_fixtures(candidates_path=CANDIDATES_FILE, mapping_path=MAPPING_FILE, scale=1):
+    """
+    Build portal responses from candidates.csv. `scale` > 1 repeats every
+    district under new IDs to simulate a larger election.
+    Returns {'zillas': [...], 'constituencies': {zilla_id: [...]}, 'candidates': {constituency_id: html}}
+    """
+    with open(mapping_path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    zilla_ids = {}
+    for division in mapping['divisions'].values():
+        for zilla_id, name in division['districts'].items():
+            zilla_ids[DISTRICT_NAME_FIXES.get(name, name)] = zilla_id
+
+    fixtures = {'zillas': [], 'constituencies': {}, 'candidates': {}}
+    with open(candidates_path, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    for k in range(scale):
+        seen = set()
+        for n, row in enumerate(rows):
+            base_id = zilla_ids.get(row['parent_district'], str(900 + len(seen)))
+            zilla_id = base_id if k == 0 else str(int(base_id) + 1000 * k)
+            if zilla_id not in seen:
+                seen.add(zilla_id)
+                fixtures['zillas'].append({'zillaID': zilla_id, 'zilla_name': row['Districts']})
+                fixtures['constituencies'][zilla_id] = []
+
+            constituency_id = str(100000 * k + n + 1)
+            fixtures['constituencies'][zilla_id].append({
+                'constituencyID': constituency_id,
+                'constituency_name': row['Electoral Name Clean'],
+            })
+            candidates = [
+                {'name': row[f'Candidate_{i}'], 'party': row[f'Party_{i}'],
+                 'symbol': row[f'Symbol_{i}'], 'img': row[f'Img_{i}']}
+                for i in range(1, MAX_CANDIDATES + 1) if row.get(f'Candidate_{i}')
+            ]
+            fixtures['candidates'][constituency_id] = candidates_html(candidates)
+    return fixtures
+
+
+def load_recorded_fixtures(directory):
+    """
+    Recorded responses: zillas.json, constituencies/<zillaID>.json and
+    candidates/<constituencyID>.html (raw portal payloads)
+    """
+    directory = Path(directory)
+    with open(directory / 'zillas.json', 'r', encoding='utf-8') as f:
+        zillas = json.load(f).get('zillas', [])
+    fixtures = {'zillas': zillas, 'constituencies': {}, 'candidates': {}}
+    for path in (directory / 'constituencies').glob('*.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            fixtures['constituencies'][path.stem] = json.load(f).get('constituencies', [])
+    for path in (directory / 'candidates').glob('*.html'):
+        fixtures['candidates'][path.stem] = path.read_text(encoding='utf-8')
+    return fixtures
+
+
+def record_fixtures(fixtures, directory):
+    """Write fixtures in the recorded layout (useful to edit or pin a synthetic set)"""
+    directory = Path(directory)
+    (directory / 'constituencies').mkdir(parents=True, exist_ok=True)
+    (directory / 'candidates').mkdir(parents=True, exist_ok=True)
+    with open(directory / 'zillas.json', 'w', encoding='utf-8') as f:
+        json.dump({'zillas': fixtures['zillas']}, f, ensure_ascii=False)
+    for zilla_id, constituencies in fixtures['constituencies'].items():
+        with open(directory / 'constituencies' / f"{zilla_id}.json", 'w', encoding='utf-8') as f:
+            json.dump({'constituencies': constituencies}, f, ensure_ascii=False)
+    for constituency_id, page in fixtures['candidates'].items():
+        (directory / 'candidates' / f"{constituency_id}.html").write_text(page, encoding='utf-8')
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockPortal:
+    """Fixtures plus the fault/latency settings and counters shared by all handler threads"""
+
+    def __init__(self, fixtures, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=0,
+                 pad_bytes=0, seed=None):
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.pad_bytes = pad_bytes
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'not_found': 0, 'bytes': 0}
+
+    def count(self, key, nbytes=0):
+        with self.lock:
+            self.stats[key] += 1
+            self.stats['bytes'] += nbytes
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            fail = self.random.random() < self.error_rate
+        seconds = max(0.0, self.latency_ms + jitter) / 1000
+        if seconds:
+            time.sleep(seconds)
+        return fail
+
+    def respond(self, path, query):
+        """Returns (status, content type, body) for one request"""
+        q = {k: v[0] for k, v in parse_qs(query).items()}
+        if path == '/':
+            return 200, 'text/html', '<html><body>EC portal stand-in</body></html>'
+        if path == '/election-settings/get-election-zilla':
+            return 200, 'application/json', json.dumps({'zillas': self.fixtures['zillas']}, ensure_ascii=False)
+        if path == '/election/get-setting-constituency':
+            constituencies = self.fixtures['constituencies'].get(q.get('zillaID', ''), [])
+            return 200, 'application/json', json.dumps({'constituencies': constituencies}, ensure_ascii=False)
+        if path == '/get/candidate/data':
+            page = self.fixtures['candidates'].get(q.get('constituency_id', ''))
+            if page is None:
+                return 404, 'text/html', ''
+            if self.pad_bytes:
+                page += f"<!-- {'x' * self.pad_bytes} -->"
+            return 200, 'text/html', page
+        return 404, 'text/html', ''
+
+
+def make_handler(portal):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send(self, status, content_type, body):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return len(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/_stats':
+                with portal.lock:
+                    stats = dict(portal.stats)
+                self.send(200, 'application/json', json.dumps(stats))
+                return
+
+            portal.count('requests')
+            if portal.bucket and not portal.bucket.take():
+                portal.count('throttled')
+                self.send(429, 'text/plain', 'Too Many Requests')
+                return
+            if portal.delay():
+                portal.count('errors')
+                self.send(500, 'text/plain', 'Internal Server Error')
+                return
+
+            status, content_type, body = portal.respond(url.path, url.query)
+            nbytes = self.send(status, content_type, body)
+            portal.count('ok' if status == 200 else 'not_found', nbytes)
+
+        def log_message(self, format, *args):
+            pass  # Keep load tests quiet
+
+    return Handler
+
+
+def start_server(portal, port=0, bind='127.0.0.1'):
+    """Run the stand-in in a background thread, returns (server, base URL); port 0 picks a free one"""
+    server = ThreadingHTTPServer((bind, port), make_handler(portal))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{bind}:{server.server_address[1]}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the EC candidate portal")
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--fixtures', help="Directory of recorded responses (default: synthesize from candidates.csv)")
+    parser.add_argument('--candidates', default=str(CANDIDATES_FILE))
+    parser.add_argument('--scale', type=int, default=1, help="Repeat the synthetic election N times")
+    parser.add_argument('--record', help="Write the fixtures to this directory and exit")
+    parser.add_argument('--latency', type=float, default=0, help="Mean response latency (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="Latency jitter, +/- ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--rate-limit', type=float, default=0, help="Requests/sec before answering 429 (0 = off)")
+    parser.add_argument('--pad-bytes', type=int, default=0, help="Extra bytes added to every candidate page")
+    parser.add_argument('--seed', type=int, help="Random seed for reproducible faults")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.fixtures:
+        fixtures = load_recorded_fixtures(args.fixtures)
+    else:
+        fixtures = synthesize_fixtures(args.candidates, scale=args.scale)
+
+    if args.record:
+        record_fixtures(fixtures, args.record)
+        print(f"✓ Recorded {len(fixtures['candidates'])} constituencies to {args.record}")
+        return
+
+    portal = MockPortal(fixtures, args.latency, args.jitter, args.error_rate, args.rate_limit,
+                        args.pad_bytes, args.seed)
+    server = ThreadingHTTPServer((args.bind, args.port), make_handler(portal))
+    server.daemon_threads = True
+    print(f"EC portal stand-in: {len(fixtures['zillas'])} districts, "
+          f"{len(fixtures['candidates'])} constituencies at http://{args.bind}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{portal.stats}")
+
+
+if __name__ == "__main__":
+    main()
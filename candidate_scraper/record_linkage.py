@@ -0,0 +1,340 @@
+"""
+Wikipedia <-> EC Record Linkage
+Replaces the manual merge of candidate_scrape.py output (English names from
+Wikipedia in unnamed Extra_N columns) into candidates.csv (Bengali names from
+the EC portal).
+
+Records are only compared inside blocks:
+1. same constituency and same normalized party
+2. leftovers of (1), same constituency only (independents, party renames)
+Within a block, Bengali names are transliterated to Latin, both sides are
+reduced to a phonetic skeleton (titles and inner vowels dropped) and scored
+with a vectorized rapidfuzz cdist; pairs are then assigned greedily by score.
+A pair is only linked if each side's given name (first token that is not an
+initial) also appears on the other side: a shared surname alone (Bashir Ahmed
+vs Sabbir Ahmed) scores high but is a different person.
+
+Outputs:
+- MERGED_FILE: one row per EC candidate with the matched English name/party
+- REPORT_FILE: every pair and leftover with score and status
+  (matched / review / ec_only / wiki_only). Only same-party links can be
+  'matched'; a link made on the constituency alone is always 'review'.
+
+Requirements:
+- pip install pandas rapidfuzz
+
+Usage:
+    python record_linkage.py
+    python record_linkage.py --ec ../python_map/candidates.csv --wiki detailed_election_results.csv
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from bengali import normalize_bengali
+
+# --- CONFIGURATION ---
+EC_FILE = Path(__file__).parent / "../python_map/candidates.csv"
+WIKI_FILE = Path(__file__).parent / "detailed_election_results.csv"
+MERGED_FILE = Path(__file__).parent / "merged_candidates.csv"
+REPORT_FILE = Path(__file__).parent / "linkage_report.csv"
+MATCH_THRESHOLD = 70  # Minimum name score to link two records
+REVIEW_THRESHOLD = 80  # Links below this (or without a party match) are marked for review
+GIVEN_NAME_THRESHOLD = 75  # Minimum score between a given name and its best token on the other side
+MAX_CANDIDATES = 15
+# ---------------------
+
+# Canonical party key -> substrings identifying it in Bengali (EC) or English (Wikipedia).
+# Order matters: more specific entries first.
+PARTY_ALIASES = {
+    'jp-manju': ['জাতীয় পার্টি - জেপি', 'jatiya party (manju)', 'jatiya party-jp', 'jatiya party (jp)'],
+    'bjp': ['বাংলাদেশ জাতীয় পার্টি', 'বিজেপি', 'bangladesh jatiya party', 'bjp'],
+    'bnp': ['জাতীয়তাবাদী দল', 'nationalist party', 'bnp'],
+    'jamaat': ['জামায়াতে ইসলামী', 'jamaat'],
+    'iab': ['ইসলামী আন্দোলন', 'islami andolan'],
+    'jp': ['জাতীয় পার্টি', 'jatiya party'],
+    'independent': ['স্বতন্ত্র', 'independent'],
+    'gop': ['গণঅধিকার পরিষদ', 'gono odhikar', 'gana odhikar'],
+    'cpb': ['কমিউনিস্ট পার্টি', 'communist party'],
+    'ncp': ['জাতীয় নাগরিক পার্টি', 'national citizen party'],
+    'bkm': ['বাংলাদেশ খেলাফত মজলিস', 'bangladesh khelafat majlis'],
+    'khelafat': ['খেলাফত মজলিস', 'khelafat majlis'],
+    'ab-party': ['এবি পার্টি', 'amar bangladesh'],
+    'jsd': ['জেএসডি', 'জাসদ', 'জাতীয় সমাজতান্ত্রিক দল', 'jatiya samajtantrik dal', 'jsd', 'jasad'],
+    'basad-marxist': ['সমাজতান্ত্রিক দল (মার্কসবাদী)', 'socialist party (marxist)', 'basad (marxist)'],
+    'basad': ['সমাজতান্ত্রিক দল', 'socialist party', 'basad'],
+    'insaniyat': ['ইনসানিয়াত বিপ্লব', 'insaniyat biplob'],
+    'islami-front': ['ইসলামী ফ্রন্ট', 'islami front'],
+    'npp': ['ন্যাশনাল পিপলস পার্টি', "national people's party", 'national peoples party'],
+}
+
+# Titles and honorifics that one source writes and the other often omits
+BENGALI_TITLES = [
+    'মোহাম্মদ', 'মুহাম্মদ', 'মোঃ', 'মো:', 'মোছাঃ', 'মোসাম্মৎ', 'মিসেস', 'ডাঃ', 'ডা:', 'ড.',
+    'আলহাজ্ব', 'আলহাজ', 'অধ্যক্ষ', 'অধ্যাপক', 'এ্যাডভোকেট', 'অ্যাডভোকেট', 'ইঞ্জিনিয়ার', 'প্রফেসর',
+]
+LATIN_TITLES = {
+    'md', 'mohammad', 'mohammed', 'muhammad', 'mohd', 'mst', 'mosammat', 'mrs', 'dr', 'alhaj', 'alhaji',
+    'haji', 'adv', 'advocate', 'engr', 'engineer', 'prof', 'professor', 'principal',
+}
+
+# Simplified Bengali -> Latin transliteration (enough to line up with Wikipedia spellings)
+CONSONANTS = {
+    'ক': 'k', 'খ': 'kh', 'গ': 'g', 'ঘ': 'gh', 'ঙ': 'ng', 'চ': 'ch', 'ছ': 'chh', 'জ': 'j', 'ঝ': 'jh',
+    'ঞ': 'n', 'ট': 't', 'ঠ': 'th', 'ড': 'd', 'ঢ': 'dh', 'ণ': 'n', 'ত': 't', 'থ': 'th', 'দ': 'd',
+    'ধ': 'dh', 'ন': 'n', 'প': 'p', 'ফ': 'f', 'ব': 'b', 'ভ': 'bh', 'ম': 'm', 'য': 'j', 'র': 'r',
+    'ল': 'l', 'শ': 'sh', 'ষ': 'sh', 'স': 's', 'হ': 'h', 'ৎ': 't',
+}
+NUKTA_CONSONANTS = {'ড': 'r', 'ঢ': 'rh', 'য': 'y'}  # ড়, ঢ়, য় after normalize_bengali
+VOWEL_SIGNS = {
+    'া': 'a', 'ি': 'i', 'ী': 'i', 'ু': 'u', 'ূ': 'u', 'ৃ': 'ri', 'ে': 'e', 'ৈ': 'oi', 'ো': 'o', 'ৌ': 'ou',
+}
+VOWELS = {
+    'অ': 'o', 'আ': 'a', 'ই': 'i', 'ঈ': 'i', 'উ': 'u', 'ঊ': 'u', 'ঋ': 'ri', 'এ': 'e', 'ঐ': 'oi',
+    'ও': 'o', 'ঔ': 'ou',
+}
+MODIFIERS = {'ং': 'ng', 'ঃ': '', 'ঁ': 'n'}
+NUKTA = '়'
+HASANTA = '্'
+
+
+def transliterate(text):
+    """Romanize Bengali text; inherent vowels are written 'o' except at word ends"""
+    text = normalize_bengali(text)
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        nxt = text[i + 1] if i + 1 < len(text) else ''
+        if ch in CONSONANTS or ch in NUKTA_CONSONANTS:
+            if nxt == NUKTA:
+                out.append(NUKTA_CONSONANTS.get(ch, CONSONANTS.get(ch, '')))
+                i += 1
+                nxt = text[i + 1] if i + 1 < len(text) else ''
+            else:
+                out.append(CONSONANTS[ch])
+            # Inherent vowel unless a vowel sign/hasanta follows or the word ends
+            if nxt and nxt not in VOWEL_SIGNS and nxt != HASANTA and not nxt.isspace() and ch != 'ৎ':
+                out.append('o')
+        elif ch in VOWEL_SIGNS:
+            out.append(VOWEL_SIGNS[ch])
+        elif ch in VOWELS:
+            out.append(VOWELS[ch])
+        elif ch in MODIFIERS:
+            out.append(MODIFIERS[ch])
+        elif ch == HASANTA:
+            pass
+        else:
+            out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def name_key(name):
+    """Phonetic skeleton of a Bengali or Latin name for fuzzy comparison"""
+    if not isinstance(name, str):
+        return ''
+    name = normalize_bengali(name)
+    for title in BENGALI_TITLES:
+        name = name.replace(normalize_bengali(title), ' ')
+    name = re.sub(r'\[.*?\]|\(.*?\)', ' ', transliterate(name).lower())
+    tokens = [t for t in re.split(r'[^a-z]+', name) if t and t not in LATIN_TITLES]
+    skeleton = []
+    for token in tokens:
+        token = token.replace('ph', 'f').replace('w', 'o').replace('z', 'j').replace('q', 'k')
+        # Keep only a leading vowel: Rafiqul ~ Rofikul, Islam ~ Isolam
+        token = re.sub(r'^[aeiouy]+', 'a', token[:1]) + re.sub(r'[aeiouy]+', '', token[1:])
+        token = re.sub(r'(.)\1+', r'\1', token)  # Jalil ~ Jallil
+        skeleton.append(token)
+    return ' '.join(skeleton)
+
+
+def given_name(key):
+    """First token of a name key that is not an initial ('' if there is none)"""
+    return next((t for t in key.split() if len(t) > 2), '')
+
+
+def given_names_agree(key_a, key_b):
+    """Each side's given name matches some token of the other name"""
+    for given, other in ((given_name(key_a), key_b), (given_name(key_b), key_a)):
+        if given and max((fuzz.ratio(given, t) for t in other.split()), default=0) < GIVEN_NAME_THRESHOLD:
+            return False
+    return True
+
+
+def party_key(party):
+    """Canonical party key, or the normalized text for parties not in PARTY_ALIASES"""
+    if not isinstance(party, str) or not party.strip():
+        return ''
+    text = normalize_bengali(party).lower()
+    for key, aliases in PARTY_ALIASES.items():
+        if any(normalize_bengali(alias).lower() in text for alias in aliases):
+            return key
+    return 'other:' + text
+
+
+def seat_key(district, constituency):
+    """(district, seat number) - the Wikipedia and EC constituency spellings differ"""
+    number = str(constituency).rsplit('-', 1)[-1].strip()
+    return f"{str(district).strip().lower()}-{number}"
+
+
+def load_ec(path):
+    """EC candidates.csv (wide) -> one row per candidate"""
+    df = pd.read_csv(path, dtype=str).fillna('')
+    records = []
+    for _, row in df.iterrows():
+        for i in range(1, MAX_CANDIDATES + 1):
+            name = row.get(f'Candidate_{i}', '')
+            if not name or name == 'N/A':
+                continue
+            records.append({
+                'seat': seat_key(row['parent_district'], row['constituency']),
+                'constituency': row['constituency'],
+                'position': i,
+                'name_bn': name,
+                'party_bn': row.get(f'Party_{i}', ''),
+                'symbol': row.get(f'Symbol_{i}', ''),
+                'img': row.get(f'Img_{i}', ''),
+            })
+    return pd.DataFrame(records, columns=['seat', 'constituency', 'position', 'name_bn', 'party_bn', 'symbol', 'img'])
+
+
+def load_wiki(path):
+    """candidate_scrape.py output (Extra_N = candidate, party, candidate, party, ...) -> one row per candidate"""
+    df = pd.read_csv(path, dtype=str).fillna('')
+    extra = [c for c in df.columns if c.startswith('Extra_')]
+    records = []
+    for _, row in df.iterrows():
+        values = [row[c] for c in extra]
+        for k in range(0, len(values) - 1, 2):
+            if values[k]:
+                records.append({
+                    'seat': seat_key(row['parent_district'], row['constituency']),
+                    'constituency': row['constituency'],
+                    'name_en': values[k],
+                    'party_en': values[k + 1],
+                })
+    return pd.DataFrame(records, columns=['seat', 'constituency', 'name_en', 'party_en'])
+
+
+def link_block(ec_block, wiki_block, stage):
+    """Score every EC x Wikipedia pair in one block and assign greedily, returns link dicts"""
+    scores = process.cdist(ec_block['key'].tolist(), wiki_block['key'].tolist(),
+                           scorer=fuzz.token_sort_ratio, workers=1)
+    pairs = sorted(((scores[i, j], i, j) for i in range(len(ec_block)) for j in range(len(wiki_block))),
+                   reverse=True)
+    used_ec, used_wiki, links = set(), set(), []
+    for score, i, j in pairs:
+        if score < MATCH_THRESHOLD:
+            break
+        if i in used_ec or j in used_wiki:
+            continue
+        if not given_names_agree(ec_block['key'].iat[i], wiki_block['key'].iat[j]):
+            continue
+        used_ec.add(i)
+        used_wiki.add(j)
+        links.append({'ec': ec_block.index[i], 'wiki': wiki_block.index[j], 'score': float(score),
+                      'stage': stage})
+    return links
+
+
+def link(ec, wiki):
+    """Two blocking passes, returns the list of links"""
+    if ec.empty or wiki.empty:
+        return []
+    ec = ec.assign(key=ec['name_bn'].map(name_key), party=ec['party_bn'].map(party_key))
+    wiki = wiki.assign(key=wiki['name_en'].map(name_key), party=wiki['party_en'].map(party_key))
+
+    links = []
+    # Pass 1: constituency + party
+    wiki_groups = dict(list(wiki.groupby(['seat', 'party'])))
+    for block, ec_block in ec.groupby(['seat', 'party']):
+        if block in wiki_groups:
+            links += link_block(ec_block, wiki_groups[block], 'seat+party')
+
+    # Pass 2: leftovers, constituency only
+    ec_left = ec.drop(index=[l['ec'] for l in links])
+    wiki_left = wiki.drop(index=[l['wiki'] for l in links])
+    wiki_groups = dict(list(wiki_left.groupby('seat')))
+    for seat, ec_block in ec_left.groupby('seat'):
+        if seat in wiki_groups:
+            links += link_block(ec_block, wiki_groups[seat], 'seat')
+    return links
+
+
+def link_status(link):
+    """matched / review for a link, ec_only for an unlinked EC record"""
+    if not link:
+        return 'ec_only'
+    return 'matched' if link['stage'] == 'seat+party' and link['score'] >= REVIEW_THRESHOLD else 'review'
+
+
+def build_outputs(ec, wiki, links):
+    """Merged candidate table and the confidence report"""
+    by_ec = {l['ec']: l for l in links}
+    linked_wiki = {l['wiki'] for l in links}
+    ec_constituency = dict(zip(ec['seat'], ec['constituency']))
+
+    merged = ec.copy()
+    merged['name_en'] = [wiki.at[by_ec[i]['wiki'], 'name_en'] if i in by_ec else '' for i in ec.index]
+    merged['party_en'] = [wiki.at[by_ec[i]['wiki'], 'party_en'] if i in by_ec else '' for i in ec.index]
+    merged['confidence'] = [round(by_ec[i]['score'] / 100, 2) if i in by_ec else 0.0 for i in ec.index]
+    merged['link_status'] = [link_status(by_ec.get(i)) for i in ec.index]
+    merged = merged.drop(columns=['seat'])
+
+    report = []
+    for i, row in ec.iterrows():
+        l = by_ec.get(i)
+        w = wiki.loc[l['wiki']] if l else None
+        report.append({
+            'constituency': row['constituency'],
+            'ec_name': row['name_bn'],
+            'ec_party': row['party_bn'],
+            'wiki_name': w['name_en'] if l else '',
+            'wiki_party': w['party_en'] if l else '',
+            'score': round(l['score'], 1) if l else 0.0,
+            'stage': l['stage'] if l else '',
+            'status': link_status(l),
+        })
+    for j, w in wiki.iterrows():
+        if j not in linked_wiki:
+            report.append({'constituency': ec_constituency.get(w['seat'], w['constituency']), 'ec_name': '', 'ec_party': '',
+                           'wiki_name': w['name_en'], 'wiki_party': w['party_en'],
+                           'score': 0.0, 'stage': '', 'status': 'wiki_only'})
+    return merged, pd.DataFrame(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Link Wikipedia and EC candidate records")
+    parser.add_argument('--ec', default=str(EC_FILE))
+    parser.add_argument('--wiki', default=str(WIKI_FILE))
+    parser.add_argument('--merged', default=str(MERGED_FILE))
+    parser.add_argument('--report', default=str(REPORT_FILE))
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    ec = load_ec(args.ec)
+    wiki = load_wiki(args.wiki)
+    print(f"✓ {len(ec)} EC candidates, {len(wiki)} Wikipedia candidates")
+
+    links = link(ec, wiki)
+    merged, report = build_outputs(ec, wiki, links)
+    merged.to_csv(args.merged, index=False, encoding='utf-8')
+    report.to_csv(args.report, index=False, encoding='utf-8')
+
+    counts = report['status'].value_counts().to_dict()
+    print(f"✓ Linked {len(links)} pairs in {time.perf_counter() - start:.2f}s")
+    for status in ('matched', 'review', 'ec_only', 'wiki_only'):
+        print(f"  {status:<10} {counts.get(status, 0)}")
+    print(f"Merged dataset: {args.merged}")
+    print(f"Confidence report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+EC Portal Re-crawl Scheduler
+Long-running replacement for re-running ec_scraper.py by hand during the
+nomination and withdrawal periods. Instead of refetching every constituency,
+it keeps a priority queue of constituencies ordered by when each is next due:
+
+    due = last checked + interval
+    interval = phase interval (by status ID) * (1 + hours since last change / QUIET_HOURS)
+
+so seats that changed recently are polled often, quiet ones back off (up to
+MAX_INTERVAL), and never-crawled ones go first. Every HTTP request
+(discovery and retries included) is charged to one hourly budget. Crawl
+bookkeeping lives in the election store (crawl_state), so a restarted
+scheduler carries on where it stopped. A failed fetch never touches the
+stored candidates; the seat is simply tried again later.
+
+When a constituency's candidates change, the affected districts are rebuilt
+after DEBOUNCE_SECONDS: candidates.csv is re-exported from the store, the
+streaming build (stream_map.py) gets only the changed districts' seat shards
+rewritten, and the folium map is rebuilt with the GeoJSON kept parsed.
+
+Usage:
+    python recrawl_daemon.py                            # run until Ctrl+C
+    python recrawl_daemon.py --once                     # crawl what is due now, rebuild, exit
+    python recrawl_daemon.py --budget 300 --map --stream-dir ../python_map/build
+    python recrawl_daemon.py --base-url http://127.0.0.1:8478 --status-id 0   # against mock_ec_server.py
+"""
+
+import argparse
+import heapq
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import ec_scraper
+import election_store
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Map builders are loaded through the CLI (the folium builder's file name is not importable)
+sys.path.insert(0, str(ROOT))
+from readolo import load_module
+
+# --- CONFIGURATION ---
+OUTPUT_FILE = ec_scraper.OUTPUT_FILE
+STREAM_DIR = ROOT / "python_map" / "build"
+BUDGET_PER_HOUR = 600  # Portal requests per hour, retries and discovery included
+PHASE_INTERVALS = {  # Status ID -> base re-check interval (seconds)
+    11: 6 * 3600,  # Finalized candidates rarely change
+}
+DEFAULT_INTERVAL = 30 * 60  # Nomination / withdrawal phases: lists change daily
+QUIET_HOURS = 12  # Interval grows by one base interval per QUIET_HOURS without a change
+MAX_INTERVAL = 24 * 3600
+DEBOUNCE_SECONDS = 60  # Wait for further changes before rebuilding
+IDLE_SLEEP = 30  # Longest single sleep while nothing is due
+# ---------------------
+
+
+class RequestBudget:
+    """Token bucket: `per_hour` requests per hour, with bursts up to `burst`"""
+
+    def __init__(self, per_hour, burst=None):
+        self.rate = per_hour / 3600
+        self.capacity = burst or max(1.0, per_hour / 60)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.spent = 0
+
+    def wait(self):
+        """Block until a request may be made, then spend it"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.spent += 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+def phase_interval(status_id):
+    return PHASE_INTERVALS.get(status_id, DEFAULT_INTERVAL)
+
+
+def next_due(state, base_interval, now):
+    """When a constituency should be fetched next (0 = never fetched, go first)"""
+    if state['last_checked'] is None:
+        return 0.0
+    quiet_hours = (now - (state['last_changed'] or state['last_checked'])) / 3600
+    interval = min(MAX_INTERVAL, base_interval * (1 + quiet_hours / QUIET_HOURS))
+    return state['last_checked'] + interval
+
+
+def discover(conn, election_id):
+    """Register every constituency of the election in the store (3 + ~64 requests)"""
+    division_mapping = ec_scraper.load_division_mapping()
+    districts = ec_scraper.get_districts(election_id)
+    for district in districts:
+        zilla_id = district['zillaID']
+        mapping = division_mapping.get(zilla_id, {})
+        district_en = mapping.get('district_en', district['zilla_name'])
+        district_en = ec_scraper.DISTRICT_NAME_FIXES.get(district_en, district_en)
+
+        for const in ec_scraper.get_constituencies(zilla_id, election_id):
+            _, const_num = ec_scraper.parse_constituency_name(const['constituency_name'])
+            election_store.upsert_constituency(
+                conn, election_id, const['constituencyID'], zilla_id=zilla_id,
+                district_bn=district['zilla_name'], district_en=district_en,
+                division=mapping.get('division', 'Unknown'), name_bn=const['constituency_name'],
+                code=f"{district_en}-{const_num}" if const_num else const['constituency_name'])
+    conn.commit()
+    return len(districts)
+
+
+class Rebuilder:
+    """Targeted rebuilds of the map outputs for a set of changed districts"""
+
+    def __init__(self, conn, election_id, csv_path=None, stream_dir=None, build_map=False):
+        self.conn = conn
+        self.election_id = election_id
+        self.csv_path = csv_path
+        self.stream_dir = Path(stream_dir) if stream_dir else None
+        self.election_map = None
+        if build_map:
+            self.election_map = load_module('election_map')
+            self.geojson = self.election_map.load_geojson(self.election_map.GEOJSON_FILE)
+            self.template = self.election_map.load_template()
+            self.constituency_geojson = self.election_map.load_geojson(self.election_map.CONSTITUENCY_FILE)
+            self.geo_meta = self.election_map.geometry_meta.compute(self.geojson)
+
+    def rebuild(self, districts):
+        start = time.perf_counter()
+        df = pd.DataFrame(election_store.election_rows(self.conn, self.election_id),
+                          columns=election_store.csv_columns())
+        done = []
+
+        if self.csv_path:
+            df.to_csv(self.csv_path, index=False, encoding='utf-8')
+            done.append('csv')
+
+        if self.stream_dir and (self.stream_dir / 'manifest.json').exists():
+            stream_map = load_module('stream_map')
+            updated = all(
+                stream_map.update_area(self.stream_dir, district,
+                                       df[df['parent_district'] == district].to_dict('records'))
+                for district in districts)
+            if not updated:
+                # A district the build has not seen: the page's area index changes too.
+                # Build from the store's rows, not a candidates.csv that --no-csv left stale.
+                with tempfile.TemporaryDirectory() as tmp:
+                    csv_path = Path(tmp) / 'candidates.csv'
+                    df.to_csv(csv_path, index=False, encoding='utf-8')
+                    stream_map.build(csv_path, stream_map.GEOJSON_FILE, self.stream_dir)
+            done.append('stream' if updated else 'stream (full)')
+
+        if self.election_map:
+            self.election_map.build_map(df, self.geojson, self.template, self.election_map.OUTPUT_FILE,
+                                        self.constituency_geojson, self.geo_meta)
+            done.append('map')
+
+        print(f"✓ Rebuilt {', '.join(done) or 'nothing'} for {', '.join(sorted(districts))} "
+              f"in {time.perf_counter() - start:.2f}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Priority-scheduled re-crawl of the EC portal")
+    parser.add_argument('--election-id', type=int, default=ec_scraper.ELECTION_ID)
+    parser.add_argument('--status-id', type=int, default=ec_scraper.STATUS_ID,
+                        help="Candidate status filter; also picks the re-check interval")
+    parser.add_argument('--db', default=str(election_store.DB_FILE))
+    parser.add_argument('--base-url', default=ec_scraper.BASE_URL)
+    parser.add_argument('--budget', type=float, default=BUDGET_PER_HOUR,
+                        help="Portal requests per hour (retries included)")
+    parser.add_argument('--interval', type=float, help="Base re-check interval in seconds (default: by status ID)")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS)
+    parser.add_argument('--discover', action='store_true',
+                        help="Re-read the district/constituency lists (done anyway if the store has none)")
+    parser.add_argument('--once', action='store_true', help="Crawl what is due now, rebuild and exit")
+    parser.add_argument('--max-requests', type=int, help="Stop after this many portal requests")
+    parser.add_argument('--no-csv', action='store_true', help=f"Do not re-export {OUTPUT_FILE}")
+    parser.add_argument('--stream-dir', default=str(STREAM_DIR),
+                        help="Streaming build to update in place (skipped if it has no manifest.json)")
+    parser.add_argument('--map', action='store_true', help="Also rebuild the folium map page")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    ec_scraper.BASE_URL = args.base_url.rstrip('/')
+    base_interval = args.interval if args.interval is not None else phase_interval(args.status_id)
+
+    # Every HTTP request ec_scraper makes, retries included, is charged to the budget
+    budget = RequestBudget(args.budget)
+    ec_scraper.REQUEST_HOOK = budget.wait
+
+    conn = election_store.connect(args.db)
+    election_store.upsert_election(conn, args.election_id, '', args.status_id or None)
+    if args.discover or not election_store.crawl_states(conn, args.election_id):
+        print("Discovering constituencies...")
+        print(f"✓ {discover(conn, args.election_id)} districts")
+
+    now = time.time()
+    states = {s['constituency_id']: s for s in election_store.crawl_states(conn, args.election_id)}
+    queue = [(next_due(s, base_interval, now), cid) for cid, s in states.items()]
+    heapq.heapify(queue)
+    print(f"Scheduling {len(queue)} constituencies, base interval {base_interval / 60:.0f} min, "
+          f"budget {args.budget:.0f} requests/hour")
+
+    symbol_images = ec_scraper.load_symbol_images()
+    rebuilder = Rebuilder(conn, args.election_id, None if args.no_csv else OUTPUT_FILE.resolve(),
+                          args.stream_dir, args.map)
+    dirty = set()
+    last_change = 0.0
+    stats = {'checks': 0, 'changes': 0, 'errors': 0}
+    deadline = time.time() if args.once else None
+
+    try:
+        while queue:
+            if args.max_requests is not None and budget.spent >= args.max_requests:
+                break
+            due, cid = queue[0]
+            now = time.time()
+            if dirty and deadline is None and now - last_change >= args.debounce:
+                rebuilder.rebuild(dirty)
+                dirty.clear()
+                continue
+            if deadline is not None and due > deadline:
+                break
+            if due > now:
+                wait = due - now
+                if dirty:
+                    wait = min(wait, last_change + args.debounce - now)
+                time.sleep(max(0.0, min(wait, IDLE_SLEEP)))
+                continue
+
+            heapq.heappop(queue)
+            state = states[cid]
+            try:
+                html = ec_scraper.get_candidates(state['zilla_id'], state['ec_constituency_id'],
+                                                 args.election_id, args.status_id)
+                candidates = ec_scraper.parse_candidates_html(html)
+            except RuntimeError as e:
+                # Error page, portal down or throttling us: keep the stored list, try again later
+                stats['errors'] += 1
+                print(f"  ✗ {state['code']}: {e}")
+                heapq.heappush(queue, (time.time() + base_interval, cid))
+                continue
+
+            checked_at = time.time()
+            changed = election_store.replace_candidacies(conn, args.election_id, cid, state['district_en'],
+                                                         candidates, symbol_images)
+            election_store.record_check(conn, cid, checked_at, changed)
+            conn.commit()
+            stats['checks'] += 1
+            if changed:
+                stats['changes'] += 1
+                dirty.add(state['district_en'])
+                last_change = checked_at
+                print(f"  ~ {state['code']}: {len(candidates)} candidates (changed)")
+
+            state = dict(state, last_checked=checked_at,
+                         last_changed=checked_at if changed else state['last_changed'])
+            states[cid] = state
+            heapq.heappush(queue, (next_due(state, base_interval, checked_at), cid))
+    except KeyboardInterrupt:
+        pass
+
+    if dirty:
+        rebuilder.rebuild(dirty)
+    conn.close()
+    print(f"\n{stats['checks']} checks, {stats['changes']} changed, {stats['errors']} errors, "
+          f"{budget.spent} requests")
+
+
+if __name__ == "__main__":
+    main()
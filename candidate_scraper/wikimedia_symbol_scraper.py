@@ -1,15 +1,37 @@
 """
 Wikimedia Commons Symbol Image Scraper
 Searches for Bangladesh election symbol images and builds symbol_images.json
+
+Symbols are shown at 50px in the map panel, so instead of the original Commons
+file we store a small thumbnail rendition (imageinfo `iiurlwidth`). Every
+rendition is HEAD-checked and its byte size / MIME type recorded in
+symbol_images_meta.json; broken or oversized entries are dropped. Hand-verified
+KNOWN_URLS fall back to the URL itself, then to search hits, and are kept even
+if nothing passes the check.
+
+Usage:
+    python wikimedia_symbol_scraper.py             # search + validate + save
+    python wikimedia_symbol_scraper.py --validate  # only re-check symbol_images.json (refreshes the metadata)
+    python wikimedia_symbol_scraper.py --validate --drop  # ...and replace or drop bad entries
 """
 
+import argparse
 import requests
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import unquote, urlparse
 
 COMMONS_API = "https://commons.wikimedia.org/w/api.php"
 OUTPUT_FILE = "symbol_images.json"
+META_FILE = "symbol_images_meta.json"  # Symbol name → rendition url/bytes/mime
+THUMB_WIDTH = 100  # Rendition width in px (2x the 50px display size)
+MAX_IMAGE_BYTES = 30_000  # Renditions larger than this are dropped
+SEARCH_RESULTS = 5  # Search results to consider per symbol (first valid wins)
+HEAD_WORKERS = 16  # Concurrent HEAD checks
+HEADERS = {'User-Agent': 'ReadoloSymbolScraper/1.0 (https://readolo.com)'}
 
 # Bengali symbol name -> English name for searching
 # Based on official EC symbols list
@@ -130,7 +152,7 @@ KNOWN_URLS = {
 }
 
 
-def search_commons(query, limit=5):
+def search_commons(query, limit=SEARCH_RESULTS):
     """Search Wikimedia Commons for images"""
     params = {
         "action": "query",
@@ -141,7 +163,7 @@ def search_commons(query, limit=5):
         "format": "json"
     }
     try:
-        response = requests.get(COMMONS_API, params=params, timeout=10)
+        response = requests.get(COMMONS_API, params=params, headers=HEADERS, timeout=10)
         data = response.json()
         return data.get("query", {}).get("search", [])
     except Exception as e:
@@ -149,69 +171,262 @@ def search_commons(query, limit=5):
         return []
 
 
-def get_image_url(title):
-    """Get direct URL for a Commons file"""
+def title_from_url(url):
+    """Recover the Commons file title ('File:Foo.png') from an upload URL"""
+    path = urlparse(url).path
+    if '/thumb/' in path:
+        # .../thumb/a/ab/Foo.svg/100px-Foo.svg.png -> Foo.svg
+        return "File:" + unquote(path.split('/')[-2])
+    return "File:" + unquote(path.rsplit('/', 1)[-1])
+
+
+def get_image_info(title, width=THUMB_WIDTH):
+    """
+    Get a sized rendition for a Commons file.
+    Returns dict with rendition url, width, original url and original byte size,
+    or None if the file has no imageinfo.
+    """
     params = {
         "action": "query",
         "titles": title,
         "prop": "imageinfo",
-        "iiprop": "url",
+        "iiprop": "url|size|mime",
+        "iiurlwidth": width,
         "format": "json"
     }
     try:
-        response = requests.get(COMMONS_API, params=params, timeout=10)
+        response = requests.get(COMMONS_API, params=params, headers=HEADERS, timeout=10)
         data = response.json()
         pages = data.get("query", {}).get("pages", {})
         for page in pages.values():
             imageinfo = page.get("imageinfo", [])
             if imageinfo:
-                return imageinfo[0].get("url", "")
+                info = imageinfo[0]
+                return {
+                    'title': title,
+                    # thumburl is only missing for files that cannot be scaled
+                    'url': info.get("thumburl") or info.get("url", ""),
+                    'width': info.get("thumbwidth") or info.get("width"),
+                    'original_url': info.get("url", ""),
+                    'original_bytes': info.get("size"),
+                    'original_mime': info.get("mime", ""),
+                }
     except Exception as e:
         print(f"  Error getting URL: {e}")
-    return ""
+    return None
+
+
+def head_check(url):
+    """HEAD a URL and return its status, byte size and MIME type"""
+    try:
+        response = requests.head(url, headers=HEADERS, timeout=10, allow_redirects=True)
+        length = response.headers.get('Content-Length')
+        return {
+            'status': response.status_code,
+            'bytes': int(length) if length and length.isdigit() else None,
+            'mime': response.headers.get('Content-Type', '').split(';')[0].strip(),
+        }
+    except Exception as e:
+        return {'status': None, 'bytes': None, 'mime': '', 'error': str(e)}
+
+
+def validate_urls(urls, workers=HEAD_WORKERS):
+    """HEAD-check many URLs concurrently, returns {url: check}"""
+    urls = sorted({u for u in urls if u})
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(urls, pool.map(head_check, urls)))
+
+
+def problem_with(check):
+    """Return a short reason why a checked image is unusable, or '' if it is fine"""
+    if check['status'] != 200:
+        return f"broken ({check.get('error') or check['status']})"
+    if not check['mime'].startswith('image/'):
+        return f"not an image ({check['mime'] or 'no content-type'})"
+    if check['bytes'] is None:
+        return ''  # Server did not report a size; nothing to hold against it
+    if check['bytes'] > MAX_IMAGE_BYTES:
+        return f"oversized ({check['bytes']:,} bytes)"
+    return ''
+
+
+def known_rendition(bengali):
+    """The hand-verified URL itself, as a rendition entry"""
+    url = KNOWN_URLS[bengali]
+    return {'title': title_from_url(url), 'url': url, 'width': None,
+            'original_url': url, 'original_bytes': None, 'original_mime': ''}
+
+
+def find_renditions(bengali, english):
+    """Candidate renditions for a symbol, best first (known URL's rendition, the known URL, else search hits)"""
+    if KNOWN_URLS.get(bengali):
+        info = get_image_info(title_from_url(KNOWN_URLS[bengali]))
+        return ([info] if info else []) + [known_rendition(bengali)]
+    return search_renditions(bengali, english)
+
+
+def search_renditions(bengali, english):
+    """Renditions of the Commons search hits for a symbol"""
+    print(f"\nSearching: {bengali} ({english})...")
+    renditions = []
+    for result in search_commons(english):
+        info = get_image_info(result.get("title", ""))
+        if info and info['url']:
+            renditions.append(info)
+        time.sleep(0.1)  # Rate limiting
+    if not renditions:
+        print(f"  No results found")
+    return renditions
+
+
+def choose(bengali, renditions, checks):
+    """First rendition that is reachable, an image, and small enough; returns (info, check) or None"""
+    for info in renditions:
+        check = checks[info['url']]
+        problem = problem_with(check)
+        if problem:
+            print(f"  ✗ {bengali}: {info['title']} {problem}")
+            continue
+        return info, check
+    return None
+
 
+def rendition_meta(info, check):
+    return {
+        'url': info['url'],
+        'title': info['title'],
+        'width': info['width'],
+        'bytes': check['bytes'],
+        'mime': check['mime'],
+        'original_url': info['original_url'],
+        'original_bytes': info['original_bytes'],
+    }
+
+
+def validate_existing(drop=False):
+    """Re-check the URLs already in symbol_images.json and refresh symbol_images_meta.json"""
+    output_path = Path(__file__).parent / OUTPUT_FILE
+    meta_path = Path(__file__).parent / META_FILE
+    with open(output_path, 'r', encoding='utf-8') as f:
+        symbol_images = json.load(f)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = {}
+
+    checks = validate_urls(symbol_images.values())
+    bad = 0
+    changed = {'replaced': 0, 'kept': 0, 'dropped': 0}
+    for bengali, url in symbol_images.items():
+        if not url:
+            meta.pop(bengali, None)
+            continue
+        check = checks[url]
+        problem = problem_with(check)
+        if meta.get(bengali, {}).get('url') != url:
+            meta[bengali] = {'url': url, 'title': title_from_url(url)}
+        meta[bengali].update({'bytes': check['bytes'], 'mime': check['mime'], 'problem': problem})
+        if problem:
+            bad += 1
+            print(f"✗ {bengali}: {problem} {url}")
+            if drop:
+                # Prefer a small rendition of the same file over dropping the symbol
+                info = get_image_info(title_from_url(url))
+                rendition = head_check(info['url']) if info and info['url'] != url else None
+                if rendition and not problem_with(rendition):
+                    symbol_images[bengali] = info['url']
+                    meta[bengali] = rendition_meta(info, rendition)
+                    changed['replaced'] += 1
+                    print(f"  → {bengali}: rendition {rendition['bytes'] or '?'} bytes {info['url']}")
+                elif KNOWN_URLS.get(bengali):
+                    changed['kept'] += 1
+                    print(f"  ! {bengali}: keeping hand-verified URL")
+                else:
+                    symbol_images[bengali] = ""
+                    meta.pop(bengali)
+                    changed['dropped'] += 1
+        else:
+            print(f"✓ {bengali}: {check['bytes'] or '?'} bytes, {check['mime']}")
+
+    if drop and bad:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(symbol_images, f, ensure_ascii=False, indent=2)
+        print(f"\n{bad} problem entries in {output_path}: {changed['replaced']} replaced by renditions, "
+              f"{changed['kept']} hand-verified kept, {changed['dropped']} dropped")
+    else:
+        print(f"\n{bad} problem entries")
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    print(f"Metadata refreshed in {meta_path}")
+    return bad
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find and validate election symbol images")
+    parser.add_argument('--validate', action='store_true',
+                        help=f"Only re-check the URLs in {OUTPUT_FILE}")
+    parser.add_argument('--drop', action='store_true',
+                        help="With --validate, swap bad entries for a small rendition, else remove them "
+                             "(hand-verified KNOWN_URLS are kept)")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        bad = validate_existing(drop=args.drop)
+        sys.exit(1 if bad and not args.drop else 0)
 
-def main():
     print("=" * 60)
     print("Wikimedia Commons Symbol Image Scraper")
     print("=" * 60)
 
-    # Start with known URLs
-    symbol_images = dict(KNOWN_URLS)
-
-    # Search for remaining symbols
+    # Collect candidate renditions for every symbol
+    candidates = {}
     for bengali, english in SYMBOLS.items():
-        if bengali in symbol_images and symbol_images[bengali]:
-            print(f"✓ {bengali}: Already have URL")
-            continue
-
         if not english:  # Skip empty (like স্বতন্ত্র)
-            symbol_images[bengali] = ""
+            candidates[bengali] = []
             continue
+        candidates[bengali] = find_renditions(bengali, english)
+        time.sleep(0.5)  # Rate limiting
 
-        print(f"\nSearching: {bengali} ({english})...")
-        results = search_commons(english)
-
-        if results:
-            # Get the first result's URL
-            title = results[0].get("title", "")
-            url = get_image_url(title)
-            if url:
-                print(f"  Found: {title}")
-                symbol_images[bengali] = url
-            else:
-                print(f"  No URL for: {title}")
-                symbol_images[bengali] = ""
+    # Validate all renditions in one concurrent pass
+    print(f"\nChecking {sum(len(c) for c in candidates.values())} renditions...")
+    checks = validate_urls(info['url'] for c in candidates.values() for info in c)
+    chosen = {bengali: choose(bengali, renditions, checks) for bengali, renditions in candidates.items()}
+
+    # Known symbols whose URL did not pass: try search hits, and keep the known URL if none do
+    retry = {b: search_renditions(b, SYMBOLS[b]) for b, c in chosen.items() if not c and KNOWN_URLS.get(b)}
+    if retry:
+        checks.update(validate_urls(info['url'] for c in retry.values() for info in c))
+        for bengali, renditions in retry.items():
+            chosen[bengali] = choose(bengali, renditions, checks)
+
+    symbol_images = {}
+    meta = {}
+    original_bytes = rendition_bytes = 0
+    for bengali, choice in chosen.items():
+        if choice:
+            info, check = choice
+            print(f"✓ {bengali}: {info['title']} ({check['bytes'] or '?'} bytes, {check['mime']})")
+        elif KNOWN_URLS.get(bengali):
+            # Hand-verified: a network hiccup or an oversized file should not drop it
+            info = known_rendition(bengali)
+            check = checks.get(info['url']) or {'bytes': None, 'mime': ''}
+            print(f"! {bengali}: keeping known URL without a usable rendition")
         else:
-            print(f"  No results found")
             symbol_images[bengali] = ""
-
-        time.sleep(0.5)  # Rate limiting
+            continue
+        symbol_images[bengali] = info['url']
+        meta[bengali] = rendition_meta(info, check)
+        original_bytes += info['original_bytes'] or 0
+        rendition_bytes += check['bytes'] or 0
 
     # Save results
     output_path = Path(__file__).parent / OUTPUT_FILE
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(symbol_images, f, ensure_ascii=False, indent=2)
+    meta_path = Path(__file__).parent / META_FILE
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
 
     # Count results
     found = sum(1 for v in symbol_images.values() if v)
@@ -219,7 +434,9 @@ def main():
 
     print("\n" + "=" * 60)
     print(f"COMPLETE: {found}/{total} symbols have images")
+    print(f"Image bytes: {original_bytes:,} original -> {rendition_bytes:,} rendition")
     print(f"Output saved to: {output_path}")
+    print(f"Metadata saved to: {meta_path}")
     print("=" * 60)
 
 
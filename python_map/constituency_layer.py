@@ -0,0 +1,211 @@
+"""
+Constituency Boundary Layer
+Dissolves finer administrative boundaries (upazila or union) into one polygon
+per parliamentary constituency, so the map can show a single seat per click.
+
+Inputs:
+- AREAS_FILE: finer boundaries, e.g. geoBoundaries BGD ADM3 (upazilas), with
+  the area name in AREA_PROPERTY
+- MAPPING_FILE: constituency code -> list of area names, e.g.
+      {"Dhaka-1": ["Dohar", "Nawabganj"], "Dhaka-2": ["Keraniganj"], ...}
+  Codes follow candidates.csv (GeoJSON district spelling + number).
+  With union-level areas, a name can be qualified by its upazila as
+  "Upazila/Union" (needs --upazilas); unqualified names match anywhere in
+  the district.
+- DISTRICTS_FILE: the ADM2 district map, used to tell apart areas that share
+  a name across districts (e.g. Nawabganj in Dhaka and in Dinajpur)
+- --upazilas: the ADM3 upazila map, used the same way for union names that
+  repeat across upazilas of one district
+
+Areas are assigned to districts (and upazilas) with a spatial join (STRtree
+index on the containing polygons, one representative point per area), then
+each constituency's areas are merged with a vectorized dissolve. The result is
+cached under CACHE_DIR keyed by a hash of the inputs, so rebuilds only redo
+the union when a boundary or mapping file actually changes.
+
+With --tolerance the constituencies are reprojected to EPSG:4326 and then
+simplified together as one coverage (shapely.coverage_simplify), so the
+tolerance is in degrees whatever the input CRS, and neighbouring seats keep
+sharing the same simplified border instead of opening gaps and overlaps.
+
+Requirements:
+- pip install geopandas shapely  (shapely >= 2.1 for --tolerance)
+
+Usage:
+    python constituency_layer.py --areas bgd_adm3.geojson --mapping constituency_areas.json
+    python constituency_layer.py --areas bgd_adm4.geojson --upazilas bgd_adm3.geojson --mapping union_areas.json
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+# --- CONFIGURATION ---
+AREAS_FILE = Path(__file__).parent / "bgd_adm3.geojson"
+MAPPING_FILE = Path(__file__).parent / "constituency_areas.json"
+DISTRICTS_FILE = Path(__file__).parent / "Bangladesh_map.geojson"
+OUTPUT_FILE = Path(__file__).parent / "constituencies.geojson"
+AREA_PROPERTY = "shapeName"
+DISTRICT_PROPERTY = "shapeName"
+UPAZILAS_FILE = None  # Only needed for "Upazila/Union" mapping entries
+UPAZILA_PROPERTY = "shapeName"
+SIMPLIFY_TOLERANCE = 0  # Degrees (0.0005 ~ 50 m); 0 keeps full detail
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_VERSION = 3  # Bump when the dissolve logic changes
+# ---------------------
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(areas_path, mapping_path, districts_path, area_property, tolerance, upazilas_path=None):
+    """Key for the dissolved layer: input file hashes plus every parameter that changes the output"""
+    parts = [
+        f"v{CACHE_VERSION}",
+        file_hash(areas_path),
+        file_hash(mapping_path),
+        file_hash(districts_path),
+        file_hash(upazilas_path) if upazilas_path else '',
+        area_property,
+        repr(tolerance),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:24]
+
+
+def normalize_name(name):
+    """Case/spacing-insensitive area name for matching"""
+    return ' '.join(str(name).lower().replace('-', ' ').split())
+
+
+def load_mapping(path):
+    """Constituency mapping as a flat table of (constituency, district, upazila, area name)
+
+    upazila_key is '' for names not written as "Upazila/Union".
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    rows = []
+    for constituency, areas in mapping.items():
+        district = constituency.rsplit('-', 1)[0]
+        for area in areas:
+            upazila, _, name = area.rpartition('/')
+            rows.append({
+                'constituency': constituency,
+                'district_key': normalize_name(district),
+                'upazila_key': normalize_name(upazila) if upazila else '',
+                'area_key': normalize_name(name),
+            })
+    return rows
+
+
+def containing_keys(points, polygons_path, name_property, crs):
+    """Normalized name of the polygon containing each point (NaN outside all of them)"""
+    import geopandas as gpd
+
+    polygons = gpd.read_file(polygons_path)[[name_property, 'geometry']]
+    polygons = polygons.rename(columns={name_property: 'container'}).to_crs(crs)
+    # sjoin builds an STRtree over the polygons
+    joined = gpd.sjoin(points, polygons, how='left', predicate='within')
+    joined = joined[~joined.index.duplicated(keep='first')]
+    return joined['container'].map(normalize_name, na_action='ignore')
+
+
+def dissolve(areas_path, mapping_path, districts_path, area_property=AREA_PROPERTY,
+             tolerance=SIMPLIFY_TOLERANCE, upazilas_path=UPAZILAS_FILE):
+    """Build the constituency GeoDataFrame (no caching)"""
+    import geopandas as gpd
+    import pandas as pd
+
+    areas = gpd.read_file(areas_path)[[area_property, 'geometry']]
+
+    # Assign each area to the district (and upazila) containing its representative point
+    points = areas.copy()
+    points['geometry'] = areas.representative_point()
+    areas['district_key'] = containing_keys(points, districts_path, DISTRICT_PROPERTY, areas.crs)
+    areas['upazila_key'] = (containing_keys(points, upazilas_path, UPAZILA_PROPERTY, areas.crs)
+                            if upazilas_path else pd.NA)
+    areas['area_key'] = areas[area_property].map(normalize_name)
+
+    mapping = pd.DataFrame(load_mapping(mapping_path))
+    qualified = mapping['upazila_key'] != ''
+    if qualified.any() and not upazilas_path:
+        print(f"  ! {qualified.sum()} 'Upazila/Union' mapping entries need --upazilas, skipping them")
+    merged = pd.concat([
+        areas.drop(columns='upazila_key').merge(mapping[~qualified], on=['district_key', 'area_key']),
+        areas.merge(mapping[qualified], on=['district_key', 'upazila_key', 'area_key']),
+    ], ignore_index=True)
+
+    # Report mapping entries that matched no area
+    matched = set(zip(merged['constituency'], merged['area_key']))
+    missing = mapping[[(c, a) not in matched for c, a in zip(mapping['constituency'], mapping['area_key'])]]
+    for row in missing.itertuples():
+        where = f"{row.upazila_key}, {row.district_key}" if row.upazila_key else row.district_key
+        print(f"  ✗ {row.constituency}: no area named '{row.area_key}' in {where}")
+
+    # Vectorized union per constituency
+    layer = merged[['constituency', 'geometry']].dissolve(by='constituency', as_index=False)
+    layer['parent_district'] = layer['constituency'].str.rsplit('-', n=1).str[0]
+    layer = layer.to_crs(epsg=4326)  # Before simplifying: the tolerance is in degrees
+    if tolerance:
+        import shapely
+        if hasattr(shapely, 'coverage_simplify'):
+            # Shared borders are simplified once for both sides
+            layer['geometry'] = shapely.coverage_simplify(layer.geometry.to_numpy(), tolerance)
+        else:
+            print(f"  ! shapely {shapely.__version__} has no coverage_simplify (2.1+), keeping full detail")
+    return layer
+
+
+def build_layer(areas_path=AREAS_FILE, mapping_path=MAPPING_FILE, districts_path=DISTRICTS_FILE,
+                output_path=OUTPUT_FILE, area_property=AREA_PROPERTY, tolerance=SIMPLIFY_TOLERANCE,
+                upazilas_path=UPAZILAS_FILE):
+    """Write the constituency layer, reusing the cached dissolve when inputs are unchanged"""
+    key = cache_key(areas_path, mapping_path, districts_path, area_property, tolerance, upazilas_path)
+    cached = CACHE_DIR / f"constituencies-{key}.geojson"
+
+    if cached.exists():
+        print(f"✓ Using cached dissolve {cached.name}")
+    else:
+        print("Dissolving areas into constituencies...")
+        start = time.perf_counter()
+        layer = dissolve(areas_path, mapping_path, districts_path, area_property, tolerance, upazilas_path)
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp = cached.with_suffix('.tmp')
+        layer.to_file(tmp, driver='GeoJSON')
+        tmp.replace(cached)
+        print(f"✓ Dissolved {len(layer)} constituencies in {time.perf_counter() - start:.1f}s")
+
+    shutil.copyfile(cached, output_path)
+    print(f"Output saved to: {output_path}")
+    return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dissolve admin areas into constituency polygons")
+    parser.add_argument('--areas', default=AREAS_FILE, help="Finer admin boundaries (GeoJSON)")
+    parser.add_argument('--mapping', default=MAPPING_FILE, help="Constituency -> area names (JSON)")
+    parser.add_argument('--districts', default=DISTRICTS_FILE, help="District boundaries (GeoJSON)")
+    parser.add_argument('--upazilas', default=UPAZILAS_FILE,
+                        help="Upazila boundaries (GeoJSON), for 'Upazila/Union' mapping entries")
+    parser.add_argument('--area-property', default=AREA_PROPERTY)
+    parser.add_argument('--tolerance', type=float, default=SIMPLIFY_TOLERANCE,
+                        help="Simplification tolerance in degrees, applied after reprojecting to EPSG:4326 "
+                             "(0 disables)")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    build_layer(args.areas, args.mapping, args.districts, args.output, args.area_property, args.tolerance,
+                args.upazilas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+District Geometry Metadata
+Precomputes per-district bounding boxes, centroids and label points
+(pole of inaccessibility) plus the overall bounds from the district GeoJSON,
+so the map page can fit its view and place labels without touching the
+polygons in the browser.
+
+All point outputs are in Leaflet order ([lat, lon]); bboxes are
+[west, south, east, north].
+
+Requirements:
+- pip install numpy
+
+Usage:
+    python geometry_meta.py   # prints the metadata table for Bangladesh_map.geojson
+"""
+
+import heapq
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+# --- CONFIGURATION ---
+GEOJSON_FILE = Path(__file__).parent / "Bangladesh_map.geojson"
+KEY_PROPERTY = "shapeName"
+LABEL_PRECISION = 0.001  # Degrees (~100 m) the label search stops at
+DECIMALS = 5
+# ---------------------
+
+
+def polygons_of(geometry):
+    """List of polygons, each a list of (n, 2) ring arrays (outer ring first)"""
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return []
+    return [[np.asarray(ring, dtype=float)[:, :2] for ring in polygon] for polygon in polygons]
+
+
+def ring_area_centroid(ring):
+    """Absolute area and centroid of one closed ring (shoelace formula)"""
+    x, y = ring[:, 0], ring[:, 1]
+    x0, y0 = x[:-1], y[:-1]
+    x1, y1 = x[1:], y[1:]
+    cross = x0 * y1 - x1 * y0
+    area = cross.sum() / 2
+    if area == 0:
+        return 0.0, ring.mean(axis=0)
+    cx = ((x0 + x1) * cross).sum() / (6 * area)
+    cy = ((y0 + y1) * cross).sum() / (6 * area)
+    return abs(area), np.array([cx, cy])
+
+
+def polygon_area_centroid(polygon):
+    """Area and centroid of a polygon with holes (holes subtract)"""
+    total = 0.0
+    moment = np.zeros(2)
+    for k, ring in enumerate(polygon):
+        area, centroid = ring_area_centroid(ring)
+        sign = 1 if k == 0 else -1
+        total += sign * area
+        moment += sign * area * centroid
+    if total <= 0:
+        return 0.0, polygon[0].mean(axis=0)
+    return total, moment / total
+
+
+def _segments(polygon):
+    """All ring edges of a polygon as (m, 2) start and end arrays"""
+    starts = np.concatenate([ring[:-1] for ring in polygon])
+    ends = np.concatenate([ring[1:] for ring in polygon])
+    return starts, ends
+
+
+def signed_distance(points, starts, ends):
+    """
+    Distance from each point (k, 2) to the polygon outline, positive inside,
+    negative outside. Vectorized over points x segments.
+    """
+    px = points[:, 0:1]
+    py = points[:, 1:2]
+    ax, ay = starts[:, 0], starts[:, 1]
+    bx, by = ends[:, 0], ends[:, 1]
+
+    # Even-odd ray casting
+    crosses = (ay > py) != (by > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_at = (bx - ax) * (py - ay) / (by - ay) + ax
+    inside = (crosses & (px < x_at)).sum(axis=1) % 2 == 1
+
+    # Distance to the nearest segment
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(((px - ax) * dx + (py - ay) * dy) / length_sq, 0, 1)
+    t = np.nan_to_num(t)
+    nearest_x = ax + t * dx
+    nearest_y = ay + t * dy
+    distance = np.sqrt(((px - nearest_x) ** 2 + (py - nearest_y) ** 2).min(axis=1))
+    return np.where(inside, distance, -distance)
+
+
+def pole_of_inaccessibility(polygon, precision=LABEL_PRECISION):
+    """
+    Interior point farthest from the outline (the "polylabel" algorithm):
+    best-first search over quadtree cells, pruning cells that cannot beat
+    the best point found so far. Longitudes are scaled by cos(latitude) so
+    distances are roughly isotropic.
+    """
+    outer = polygon[0]
+    scale = math.cos(math.radians(outer[:, 1].mean())) or 1.0
+    polygon = [ring * np.array([scale, 1.0]) for ring in polygon]
+    starts, ends = _segments(polygon)
+
+    west, south = polygon[0].min(axis=0)
+    east, north = polygon[0].max(axis=0)
+    cell_size = min(east - west, north - south)
+    if cell_size == 0:
+        return polygon[0][0] / np.array([scale, 1.0])
+    half = cell_size / 2
+
+    def cells(centers, h):
+        d = signed_distance(centers, starts, ends)
+        # (-potential, distance, x, y, half size); potential = best any point in the cell could reach
+        return [(-(di + h * math.sqrt(2)), di, c[0], c[1], h) for c, di in zip(centers, d)]
+
+    # Initial grid covering the bbox
+    xs = np.arange(west, east, cell_size) + half
+    ys = np.arange(south, north, cell_size) + half
+    grid = np.array([(x, y) for x in xs for y in ys])
+    queue = cells(grid, half)
+    heapq.heapify(queue)
+
+    # Start from the area centroid (good for convex shapes), fall back to the bbox center
+    _, centroid = polygon_area_centroid(polygon)
+    candidates = np.array([centroid, [(west + east) / 2, (south + north) / 2]])
+    distances = signed_distance(candidates, starts, ends)
+    best_distance = distances.max()
+    best = candidates[distances.argmax()]
+
+    while queue:
+        neg_potential, distance, x, y, h = heapq.heappop(queue)
+        if distance > best_distance:
+            best_distance, best = distance, np.array([x, y])
+        if -neg_potential - best_distance <= precision:
+            continue
+        # Split into four children, evaluated together
+        h /= 2
+        children = np.array([[x - h, y - h], [x + h, y - h], [x - h, y + h], [x + h, y + h]])
+        for cell in cells(children, h):
+            heapq.heappush(queue, cell)
+
+    return best / np.array([scale, 1.0])
+
+
+def feature_meta(geometry, precision=LABEL_PRECISION):
+    """bbox, centroid and label point of one (Multi)Polygon geometry"""
+    polygons = polygons_of(geometry)
+    if not polygons:
+        return None
+    coords = np.concatenate([polygon[0] for polygon in polygons])
+    west, south = coords.min(axis=0)
+    east, north = coords.max(axis=0)
+
+    areas, centroids = zip(*(polygon_area_centroid(p) for p in polygons))
+    areas = np.array(areas)
+    if areas.sum() > 0:
+        centroid = (np.array(centroids) * areas[:, None]).sum(axis=0) / areas.sum()
+    else:
+        centroid = coords.mean(axis=0)
+
+    # Label the largest part (islands and chars get no label of their own)
+    label = pole_of_inaccessibility(polygons[int(areas.argmax())], precision)
+
+    r = lambda v: round(float(v), DECIMALS)
+    return {
+        'bbox': [r(west), r(south), r(east), r(north)],
+        'centroid': [r(centroid[1]), r(centroid[0])],
+        'label': [r(label[1]), r(label[0])],
+    }
+
+
+def compute(geojson_data, key_property=KEY_PROPERTY, precision=LABEL_PRECISION):
+    """Metadata table for a FeatureCollection: {'bounds': [[s, w], [n, e]], 'districts': {name: {...}}}"""
+    districts = {}
+    for feature in geojson_data.get('features', []):
+        name = (feature.get('properties') or {}).get(key_property)
+        meta = feature_meta(feature.get('geometry') or {'type': None}, precision)
+        if name and meta:
+            districts[name] = meta
+
+    if districts:
+        boxes = np.array([d['bbox'] for d in districts.values()])
+        bounds = [[float(boxes[:, 1].min()), float(boxes[:, 0].min())],
+                  [float(boxes[:, 3].max()), float(boxes[:, 2].max())]]
+    else:
+        bounds = None
+    return {'bounds': bounds, 'districts': districts}
+
+
+def main():
+    with open(GEOJSON_FILE, 'r') as f:
+        geojson_data = json.load(f)
+    meta = compute(geojson_data)
+    print(json.dumps(meta, ensure_ascii=False, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+Streaming Map Builder
+Builds the election map for inputs too large for bangladesh-election_map.py
+(union-parishad level: thousands of areas, tens of thousands of candidates).
+
+Nothing is loaded whole: candidates are read row by row and appended to
+per-area JSON shards, GeoJSON features are decoded one at a time and written
+to geometry shards, and the page itself is a small static file that fetches
+the shards. Peak memory is bounded by the largest single feature plus a
+small per-area lookup (area -> division, area -> shard), not by input size.
+
+Output layout (serve the directory over HTTP, e.g. `python -m http.server`):
+    build/index.html
+    build/manifest.json        area -> seat shard, geometry shard count
+    build/geo/00000.json ...   FeatureCollections of FEATURES_PER_SHARD features
+    build/data/00000.json ...  seats of one area each
+
+update_area() rewrites a single area's seat shard in place, so a change in
+one constituency does not need a full rebuild.
+
+Usage:
+    python stream_map.py
+    python stream_map.py --candidates unions.csv --geojson unions.geojson \\
+        --key-property shapeName --group-column parent_district --output build
+"""
+
+import argparse
+import csv
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# --- CONFIGURATION ---
+CANDIDATES_FILE = Path(__file__).parent / "candidates.csv"
+GEOJSON_FILE = Path(__file__).parent / "Bangladesh_map.geojson"
+OUTPUT_DIR = Path(__file__).parent / "build"
+KEY_PROPERTY = "shapeName"  # GeoJSON property naming the area
+GROUP_COLUMN = "parent_district"  # CSV column naming the area of a seat
+FEATURES_PER_SHARD = 500
+COORD_PRECISION = 5  # Decimal places kept (~1 m), None keeps the input precision
+MAX_OPEN_SHARDS = 64  # Shard file handles kept open while appending
+READ_CHUNK = 1 << 16
+
+DIVISION_COLORS = {
+    'Dhaka': '#1a1a1a', 'Chattogram': '#CC0000', 'Rajshahi': '#008573',
+    'Khulna': '#D4A017', 'Sylhet': '#6D4C41', 'Barishal': '#2E7D32',
+    'Rangpur': '#C62828', 'Mymensingh': '#7B1FA2'
+}
+DEFAULT_COLOR = "#808080"
+# ---------------------
+
+
+def _seek_features(f, chunk_size):
+    """
+    Read up to the '[' that opens the top-level "features" member and return
+    the rest of that chunk (None if there is none). Tracks nesting and strings,
+    so "features" keys inside properties or foreign members are skipped.
+    """
+    depth = 0
+    in_string = escape = False
+    chars = []  # String being read at depth 1 (a key, or a value we ignore)
+    last_string = key = None
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return None
+        for i, ch in enumerate(chunk):
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+                    last_string = ''.join(chars)
+                    continue
+                if depth == 1:
+                    chars.append(ch)
+            elif ch == '"':
+                in_string = True
+                chars = []
+            elif ch == ':' and depth == 1:
+                key = last_string
+            elif ch == ',' and depth == 1:
+                key = None
+            elif ch in '[{':
+                if ch == '[' and depth == 1 and key == 'features':
+                    return chunk[i + 1:]
+                depth += 1
+            elif ch in ']}':
+                depth -= 1
+
+
+def iter_features(path, chunk_size=READ_CHUNK):
+    """
+    Yield the features of a GeoJSON FeatureCollection one at a time.
+    Only the current feature (plus one read chunk) is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = _seek_features(f, chunk_size)
+        if buf is None:
+            return
+
+        pos = 0
+        while True:
+            # Skip separators, refilling the buffer as needed
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buf):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                buf, pos = chunk, 0
+                continue
+            if buf[pos] == ']':
+                return
+
+            try:
+                feature, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Feature not complete yet: read more (growing reads keep this linear)
+                chunk = f.read(max(chunk_size, len(buf) - pos))
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+
+            yield feature
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+def round_coords(coords, ndigits):
+    """Round nested GeoJSON coordinate arrays"""
+    if isinstance(coords, float):
+        return round(coords, ndigits)
+    return [round_coords(c, ndigits) for c in coords]
+
+
+class ShardWriter:
+    """
+    Appends JSON items to one array file per key, keeping at most
+    `max_open` files open (least recently used handles are closed).
+    """
+
+    def __init__(self, directory, max_open=MAX_OPEN_SHARDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_open = max_open
+        self.index = {}  # key -> shard number
+        self.handles = OrderedDict()
+        self.bytes_written = 0
+
+    def path(self, key):
+        return self.directory / f"{self.index[key]:05d}.json"
+
+    def append(self, key, item):
+        if key not in self.index:
+            self.index[key] = len(self.index)
+            prefix = '['
+            mode = 'w'
+        else:
+            prefix = ','
+            mode = 'a'
+
+        f = self.handles.pop(key, None)
+        if f is None:
+            if len(self.handles) >= self.max_open:
+                _, oldest = self.handles.popitem(last=False)
+                oldest.close()
+            f = open(self.path(key), mode, encoding='utf-8')
+        self.handles[key] = f
+
+        text = prefix + json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+        f.write(text)
+        self.bytes_written += len(text.encode('utf-8'))
+
+    def close(self):
+        for f in self.handles.values():
+            f.close()
+        self.handles.clear()
+        # Terminate every array
+        for key in self.index:
+            with open(self.path(key), 'a', encoding='utf-8') as f:
+                f.write(']')
+        self.bytes_written += len(self.index)
+
+
+def compact_seat(row):
+    """Drop empty candidate columns: {constituency, candidates: [[name, party, symbol, img], ...]}"""
+    candidates = []
+    i = 1
+    while f'Candidate_{i}' in row:
+        name = row[f'Candidate_{i}']
+        if name and name != 'N/A':
+            candidates.append([name, row.get(f'Party_{i}', ''), row.get(f'Symbol_{i}', ''),
+                               row.get(f'Img_{i}', '')])
+        i += 1
+    return {'constituency': row.get('constituency', ''), 'candidates': candidates}
+
+
+def write_seat_shards(candidates_path, data_dir, group_column=GROUP_COLUMN):
+    """Stream the candidates CSV into per-area shards, returns (shard index, area -> division, rows)"""
+    shards = ShardWriter(data_dir)
+    area_division = {}
+    rows = 0
+    with open(candidates_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            area = row.get(group_column, '')
+            area_division.setdefault(area, row.get('divisions', ''))
+            shards.append(area, compact_seat(row))
+            rows += 1
+    shards.close()
+    return shards, area_division, rows
+
+
+def write_geometry_shards(geojson_path, geo_dir, area_division, key_property=KEY_PROPERTY,
+                          per_shard=FEATURES_PER_SHARD, precision=COORD_PRECISION):
+    """Stream GeoJSON features into FeatureCollection shards, returns (shard count, features, bytes)"""
+    geo_dir = Path(geo_dir)
+    geo_dir.mkdir(parents=True, exist_ok=True)
+    shard_count = features = bytes_written = 0
+    out = None
+
+    for feature in iter_features(geojson_path):
+        if features % per_shard == 0:
+            if out:
+                out.write(']}')
+                out.close()
+            out = open(geo_dir / f"{shard_count:05d}.json", 'w', encoding='utf-8')
+            out.write('{"type":"FeatureCollection","features":[')
+            shard_count += 1
+        else:
+            out.write(',')
+
+        # Both may be null in valid GeoJSON
+        area = (feature.get('properties') or {}).get(key_property, '')
+        geometry = feature.get('geometry')
+        if precision is not None and geometry and 'coordinates' in geometry:
+            geometry = dict(geometry, coordinates=round_coords(geometry['coordinates'], precision))
+        slim = {
+            'type': 'Feature',
+            'properties': {
+                'key': area,
+                'fill': DIVISION_COLORS.get(area_division.get(area), DEFAULT_COLOR),
+            },
+            'geometry': geometry,
+        }
+        text = json.dumps(slim, ensure_ascii=False, separators=(',', ':'))
+        out.write(text)
+        bytes_written += len(text.encode('utf-8'))
+        features += 1
+
+    if out:
+        out.write(']}')
+        out.close()
+    return shard_count, features, bytes_written
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>READOLO. Election Tracker</title>
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css">
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;700;800&display=swap" rel="stylesheet">
+<style>
+    :root { --primary: #CC0000; --dark: #1a1a1a; }
+    body { font-family: 'Inter', sans-serif; margin: 0; background: #f8fafc; }
+    .page-container { max-width: 1000px; margin: 0 auto; padding: 20px; }
+    h1 { font-size: 32px; font-weight: 800; color: var(--dark); margin: 0; letter-spacing: -1.5px; }
+    h1 span { color: var(--primary); font-weight: 300; }
+    #map { height: 550px; border-radius: 20px; border: 1px solid #e2e8f0; background: white; }
+    #status { font-size: 13px; color: #64748b; margin: 10px 0; }
+    #details-panel {
+        position: fixed; bottom: -100%; left: 0; right: 0; background: white; z-index: 10000;
+        padding: 30px; border-top-left-radius: 25px; border-top-right-radius: 25px;
+        box-shadow: 0 -10px 40px rgba(0,0,0,0.2); transition: bottom 0.4s; max-height: 80vh; overflow-y: auto;
+    }
+    #details-panel.active { bottom: 0; }
+    .close-btn { float: right; background: #f1f1f1; border: none; padding: 10px 20px; border-radius: 30px;
+                 cursor: pointer; font-weight: 800; font-size: 12px; }
+    @media (max-width: 600px) { #map { height: 450px; } .page-container { padding: 15px; } }
+</style>
+</head>
+<body>
+<div class="page-container">
+    <h1>READ<span>OLO.</span></h1>
+    <div id="status">Loading map...</div>
+    <div id="map"></div>
+</div>
+<div id="details-panel">
+    <button class="close-btn" onclick="closePanel()">CLOSE</button>
+    <div id="panel-body"></div>
+</div>
+<script>
+    const GEO_SHARDS = __GEO_SHARDS__;
+    const SEAT_SHARDS = __SEAT_SHARDS__;
+
+    const map = L.map('map', { zoomControl: false, scrollWheelZoom: false });
+    map.setView([23.8, 90.3], 6);
+    const layer = L.geoJSON(null, {
+        style: f => ({ fillColor: f.properties.fill, color: 'white', weight: 1, fillOpacity: 0.7 }),
+        onEachFeature: (f, l) => {
+            l.on('mouseover', () => l.setStyle({ fillColor: '#333', fillOpacity: 0.9 }));
+            l.on('mouseout', () => layer.resetStyle(l));
+            l.on('click', () => showArea(f.properties.key));
+        }
+    }).addTo(map);
+
+    (async function loadGeometry() {
+        const status = document.getElementById('status');
+        for (let i = 0; i < GEO_SHARDS; i++) {
+            const shard = await fetch(`geo/${String(i).padStart(5, '0')}.json`).then(r => r.json());
+            layer.addData(shard);
+            status.textContent = `Loaded ${i + 1}/${GEO_SHARDS} map sections`;
+        }
+        if (layer.getLayers().length) map.fitBounds(layer.getBounds(), { padding: [20, 20] });
+        status.textContent = 'Tap any area to view candidates.';
+    })();
+
+    function closePanel() {
+        document.getElementById('details-panel').classList.remove('active');
+    }
+
+    async function showArea(key) {
+        const shard = SEAT_SHARDS[key];
+        const seats = shard === undefined ? [] :
+            await fetch(`data/${String(shard).padStart(5, '0')}.json`).then(r => r.json());
+
+        let html = `<h2 style="margin-top:0; font-size:26px; letter-spacing:-1px;">${key}</h2>`;
+        if (seats.length === 0) html += "<p>Candidate verification in progress...</p>";
+        seats.forEach(seat => {
+            html += `<div style="margin-bottom:25px; border-top:1px solid #eee; padding-top:15px;">
+                <div style="color:var(--primary); font-weight:800; text-transform:uppercase; font-size:12px; margin-bottom:10px;">${seat.constituency}</div>
+                <div style="display:grid; grid-template-columns:repeat(auto-fill, minmax(100px, 1fr)); gap:10px;">`;
+            seat.candidates.forEach(([name, party, symbol, img]) => {
+                html += `<div style="text-align:center; border:1px solid #f1f5f9; padding:8px; border-radius:8px;">
+                    <img src="${img || 'https://placehold.co/100x100?text=Marka'}" loading="lazy" style="width:50px; height:50px; object-fit:contain; margin-bottom:5px;">
+                    <div style="font-size:10px; font-weight:700; color:var(--dark);">${name}</div>
+                    <div style="font-size:8px; color:#666; margin-top:2px;">${party}</div>
+                    ${symbol ? `<div style="font-size:7px; color:#888; margin-top:2px;">${symbol}</div>` : ''}
+                </div>`;
+            });
+            html += `</div></div>`;
+        });
+        document.getElementById('panel-body').innerHTML = html;
+        document.getElementById('details-panel').classList.add('active');
+    }
+</script>
+</body>
+</html>
+"""
+
+
+def write_page(path, geo_shards, seat_index):
+    """Write the static page; it only embeds the shard counts and the area -> shard index"""
+    page = (PAGE_TEMPLATE
+            .replace('__GEO_SHARDS__', str(geo_shards))
+            .replace('__SEAT_SHARDS__', json.dumps(seat_index, ensure_ascii=False, separators=(',', ':'))))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return len(page.encode('utf-8'))
+
+
+def build(candidates_path=CANDIDATES_FILE, geojson_path=GEOJSON_FILE, output_dir=OUTPUT_DIR,
+          key_property=KEY_PROPERTY, group_column=GROUP_COLUMN,
+          per_shard=FEATURES_PER_SHARD, precision=COORD_PRECISION):
+    """Run the streaming build, returns a stats dict"""
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    shards, area_division, rows = write_seat_shards(candidates_path, output_dir / 'data', group_column)
+    geo_shards, features, geo_bytes = write_geometry_shards(
+        geojson_path, output_dir / 'geo', area_division, key_property, per_shard, precision)
+    page_bytes = write_page(output_dir / 'index.html', geo_shards, shards.index)
+    with open(output_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump({'geo_shards': geo_shards, 'seat_shards': shards.index}, f, ensure_ascii=False)
+
+    return {
+        'seats': rows,
+        'areas': len(shards.index),
+        'features': features,
+        'geo_shards': geo_shards,
+        'output_bytes': shards.bytes_written + geo_bytes + page_bytes,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def update_area(output_dir, area, rows):
+    """
+    Rewrite the seat shard of one area from its candidates.csv-layout rows.
+    Returns False if the area is not in the build (a full build is needed).
+    """
+    output_dir = Path(output_dir)
+    try:
+        with open(output_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return False
+    shard = manifest['seat_shards'].get(area)
+    if shard is None:
+        return False
+
+    path = output_dir / 'data' / f"{shard:05d}.json"
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump([compact_seat(row) for row in rows], f, ensure_ascii=False, separators=(',', ':'))
+    tmp.replace(path)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming election map build")
+    parser.add_argument('--candidates', default=CANDIDATES_FILE)
+    parser.add_argument('--geojson', default=GEOJSON_FILE)
+    parser.add_argument('--output', default=OUTPUT_DIR)
+    parser.add_argument('--key-property', default=KEY_PROPERTY,
+                        help="GeoJSON property naming each area")
+    parser.add_argument('--group-column', default=GROUP_COLUMN,
+                        help="CSV column naming the area a seat belongs to")
+    parser.add_argument('--features-per-shard', type=int, default=FEATURES_PER_SHARD)
+    parser.add_argument('--precision', type=int, default=COORD_PRECISION,
+                        help="Coordinate decimal places (-1 keeps input precision)")
+    args = parser.parse_args(argv)
+
+    stats = build(args.candidates, args.geojson, args.output, args.key_property, args.group_column,
+                  args.features_per_shard, None if args.precision < 0 else args.precision)
+
+    print(f"✓ {stats['seats']} seats in {stats['areas']} areas, "
+          f"{stats['features']} features in {stats['geo_shards']} geometry shards")
+    print(f"✓ {stats['output_bytes']:,} bytes written to {args.output}/ in {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
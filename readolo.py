@@ -0,0 +1,163 @@
+"""
+Readolo command line
+One entry point for the scrapers and the map build. Works from any directory,
+and only imports the heavy modules (pandas, folium, bs4, geopandas, rapidfuzz) a
+subcommand actually needs.
+
+Usage:
+    python readolo.py scrape-ec [--election-id 478 ...]
+    python readolo.py recrawl [--once --budget 600 --map ...]
+    python readolo.py scrape-wiki
+    python readolo.py scrape-symbols [--validate [--drop]]
+    python readolo.py link-records
+    python readolo.py build-map [--db elections.db --election-id 478 ...]
+    python readolo.py build-stream [...]
+    python readolo.py build-constituencies [...]
+    python readolo.py serve [--port 8000]
+    python readolo.py watch    # rebuild the map when candidates.csv or the template change
+
+Options after the subcommand are passed through to the underlying script;
+`python readolo.py build-map --help` shows them.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SCRAPER_DIR = ROOT / 'candidate_scraper'
+MAP_DIR = ROOT / 'python_map'
+WEBSITE_DIR = ROOT / 'readolo_website'
+
+# subcommand -> (module, help); modules are imported only when the subcommand runs
+SCRIPTS = {
+    'scrape-ec': ('ec_scraper', "Scrape EC portal candidates (BD VPN required)"),
+    'recrawl': ('recrawl_daemon', "Keep the store fresh: re-crawl changed constituencies first"),
+    'scrape-wiki': ('candidate_scrape', "Scrape Wikipedia constituency result tables"),
+    'scrape-symbols': ('wikimedia_symbol_scraper', "Find and validate symbol images on Commons"),
+    'link-records': ('record_linkage', "Merge Wikipedia and EC candidate records"),
+    'build-map': ('election_map', "Build the folium election map page"),
+    'build-stream': ('stream_map', "Streaming (sharded) map build for large inputs"),
+    'build-constituencies': ('constituency_layer', "Dissolve admin areas into constituency polygons"),
+}
+
+
+def load_module(name):
+    """Import a repo module by name (the map builder's file name is not importable as-is)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    for directory in (SCRAPER_DIR, MAP_DIR):
+        if str(directory) not in sys.path:
+            sys.path.insert(0, str(directory))
+    if name == 'election_map':
+        spec = importlib.util.spec_from_file_location(name, MAP_DIR / 'bangladesh-election_map.py')
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    return importlib.import_module(name)
+
+
+def run_script(command, argv):
+    module = load_module(SCRIPTS[command][0])
+    return module.main(argv)
+
+
+def serve(argv):
+    """Serve the static website (and the generated map) over HTTP"""
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    parser = argparse.ArgumentParser(prog='readolo.py serve', description=serve.__doc__)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--directory', default=str(WEBSITE_DIR))
+    args = parser.parse_args(argv)
+
+    handler = partial(SimpleHTTPRequestHandler, directory=args.directory)
+    with ThreadingHTTPServer((args.bind, args.port), handler) as httpd:
+        print(f"Serving {args.directory} at http://{args.bind}:{args.port}/ (Ctrl+C to stop)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _mtime(path):
+    try:
+        return Path(path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def watch(argv):
+    """Keep inputs parsed in memory and rebuild the map whenever one of them changes"""
+    parser = argparse.ArgumentParser(prog='readolo.py watch', description=watch.__doc__)
+    parser.add_argument('--interval', type=float, default=0.25, help="Polling interval in seconds")
+    parser.add_argument('--output', help="Map page to write (default: build-map's default)")
+    args = parser.parse_args(argv)
+
+    election_map = load_module('election_map')
+    output = args.output or election_map.OUTPUT_FILE
+
+    # name -> (path, loader); each input is re-parsed only when its own file changes
+    inputs = {
+        'candidates': (election_map.CANDIDATES_FILE, election_map.load_candidates),
+        'geojson': (election_map.GEOJSON_FILE, election_map.load_geojson),
+        'template': (election_map.TEMPLATE_FILE, election_map.load_template),
+        'constituencies': (election_map.CONSTITUENCY_FILE, election_map.load_geojson),
+    }
+    parsed = {}
+    mtimes = {}
+
+    print(f"Watching {', '.join(str(p.relative_to(ROOT)) for p, _ in inputs.values())} (Ctrl+C to stop)")
+    try:
+        while True:
+            changed = [name for name, (path, _) in inputs.items()
+                       if name not in mtimes or _mtime(path) != mtimes[name]]
+            if changed:
+                start = time.perf_counter()
+                try:
+                    for name in changed:
+                        path, loader = inputs[name]
+                        mtimes[name] = _mtime(path)
+                        parsed[name] = loader(path) if mtimes[name] is not None else None
+                    if 'geojson' in changed:
+                        parsed['geo_meta'] = election_map.geometry_meta.compute(parsed['geojson'])
+                    election_map.build_map(parsed['candidates'], parsed['geojson'], parsed['template'],
+                                           output, parsed['constituencies'], parsed['geo_meta'])
+                    print(f"✓ Rebuilt ({', '.join(changed)}) in {time.perf_counter() - start:.2f}s")
+                except Exception as e:
+                    # Usually a file caught mid-save; the next write triggers another attempt
+                    print(f"✗ Rebuild failed ({', '.join(changed)}): {e}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+COMMANDS = {
+    'serve': (serve, "Serve the website over HTTP"),
+    'watch': (watch, "Rebuild the map when its inputs change"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='readolo.py', description="Readolo election scrapers and map builder",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+    for name, (_, help_text) in {**SCRIPTS, **COMMANDS}.items():
+        # No help of their own: --help goes through to the script
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command in SCRIPTS:
+        return run_script(args.command, rest)
+    return COMMANDS[args.command][0](rest)
+
+
+if __name__ == "__main__":
+    main()